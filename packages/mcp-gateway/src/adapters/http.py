@@ -0,0 +1,27 @@
+"""Shared HTTP client for calls to the backend API."""
+
+import httpx
+
+from src.config import settings
+
+
+def create_api_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client for the backend API.
+
+    One client is created per process and shared across providers, so
+    concurrent requests reuse keep-alive connections instead of paying
+    connection setup on every call.
+
+    Returns:
+        AsyncClient with base_url set to the API root
+    """
+    return httpx.AsyncClient(
+        base_url=settings.api_url,
+        http2=True,
+        timeout=httpx.Timeout(settings.api_timeout, connect=2.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.api_max_keepalive,
+            max_connections=settings.api_max_connections,
+            keepalive_expiry=60.0,
+        ),
+    )
@@ -35,6 +35,9 @@ class PostgresAdapter:
         self.write_queue: deque = deque()
         self.last_sync_timestamp: Optional[datetime] = None
 
+        # Caps concurrent Redis writes when fanning out synced rows
+        self._work_sem = asyncio.Semaphore(settings.worker_concurrency)
+
     async def connect(self):
         """Connect to PostgreSQL."""
         logger.info(f"Connecting to PostgreSQL: {settings.postgres_host}:{settings.postgres_port}")
@@ -88,16 +91,8 @@ class PostgresAdapter:
                     if rows:
                         logger.debug(f"Syncing {len(rows)} tasks from PostgreSQL to Redis")
 
-                        # Update Redis cache
-                        for row in rows:
-                            task_data = dict(row)
-
-                            # Convert datetime objects to ISO strings
-                            for key in ["created_at", "updated_at"]:
-                                if task_data.get(key):
-                                    task_data[key] = task_data[key].isoformat()
-
-                            await self.redis.set_task(task_data["id"], task_data)
+                        # Update Redis cache, a bounded number of rows at a time
+                        await asyncio.gather(*(self._cache_row(row) for row in rows))
 
                         # Update last sync timestamp
                         self.last_sync_timestamp = rows[0]["updated_at"]
@@ -106,6 +101,22 @@ class PostgresAdapter:
                 logger.error(f"Error in sync_from_postgres: {e}", exc_info=True)
                 await asyncio.sleep(5)  # Back off on error
 
+    async def _cache_row(self, row):
+        """Write one synced task row to the Redis cache.
+
+        Args:
+            row: Task row from PostgreSQL
+        """
+        task_data = dict(row)
+
+        # Convert datetime objects to ISO strings
+        for key in ["created_at", "updated_at"]:
+            if task_data.get(key):
+                task_data[key] = task_data[key].isoformat()
+
+        async with self._work_sem:
+            await self.redis.set_task(task_data["id"], task_data)
+
     async def sync_to_postgres(self):
         """Batch write Redis changes to PostgreSQL every 5s.
 
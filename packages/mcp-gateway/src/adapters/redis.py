@@ -1,15 +1,65 @@
 """Redis adapter for state caching and pub/sub."""
 
-import json
+import asyncio
+import hashlib
 import logging
 from typing import Any, Optional
 
+import msgpack
+import orjson
 import redis.asyncio as redis
+from redis.exceptions import NoScriptError
+import zstandard as zstd
 
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Cap on fire-and-forget publishes queued at once
+MAX_PENDING_PUBLISHES = 1024
+
+# Fire-and-forget publishes are sent in pipelines of up to this many,
+# waiting briefly after a lone message for others to join it
+MAX_PUBLISH_BATCH = 64
+PUBLISH_COALESCE_DELAY = 0.005  # seconds
+
+# 1-byte format tags prefixed to task state values. Entries written
+# before tagging are bare msgpack maps, whose first byte is never 0x00/0x01.
+TASK_FORMAT_MSGPACK = b"\x00"
+TASK_FORMAT_ZSTD = b"\x01"
+
+# Execution logs are Redis Streams capped near this many entries, each
+# holding the JSON-encoded step under a single field
+LOG_STREAM_MAXLEN = 10_000
+LOG_ENTRY_FIELD = b"data"
+LOG_STREAM_READ_COUNT = 100
+
+# Entries buffered per local log stream subscriber; one that falls this far
+# behind is disconnected rather than letting its queue grow without bound
+LOG_SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Put on a subscriber's queue when its stream ends (router closed, or the
+# subscriber fell behind); no more entries follow it
+LOG_STREAM_END = object()
+
+# Bound once to skip the module attribute lookup on every call
+_dumps = orjson.dumps
+_loads = orjson.loads
+
+
+def log_stream_key(task_id: str) -> str:
+    """Stream holding a task's execution log.
+
+    Not logs:{task_id}: that key held a LIST before logs moved to Streams,
+    and XADD onto a leftover list fails with WRONGTYPE until it expires.
+    """
+    return f"logstream:{task_id}"
+
+
+def log_channel(task_id: str) -> str:
+    """Pub/sub channel each log step is also published on, for existing subscribers."""
+    return f"logs:{task_id}:stream"
+
 
 class RedisAdapter:
     """Redis adapter for caching and real-time notifications.
@@ -24,18 +74,51 @@ class RedisAdapter:
     def __init__(self):
         """Initialize Redis adapter."""
         self.client: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
         self.url = settings.redis_url
         self.max_connections = settings.redis_max_connections
 
+        # Bound once so per-call paths skip the settings attribute lookups
+        self._task_cache_ttl = settings.task_cache_ttl
+
+        # Reused for every task state write. Not thread-safe, which is fine
+        # while all calls happen on the event loop thread.
+        self._packer = msgpack.Packer(use_bin_type=True)
+
+        # zstd contexts for task state, optionally primed with a dictionary
+        # trained on task payloads (see train_task_dictionary)
+        self._compress_threshold = settings.task_compress_threshold
+        zstd_dict = None
+        if settings.task_zstd_dict_path:
+            with open(settings.task_zstd_dict_path, "rb") as f:
+                zstd_dict = zstd.ZstdCompressionDict(f.read())
+        self._zctx = zstd.ZstdCompressor(level=settings.task_compress_level, dict_data=zstd_dict)
+        self._zdctx = zstd.ZstdDecompressor(dict_data=zstd_dict)
+
+        # Fire-and-forget publishes, sent in order by a background task
+        self._pub_queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_PUBLISHES)
+        self._publisher: Optional[asyncio.Task] = None
+
+        # Lua sources by SHA1, for EVAL when the server lacks a cached script
+        self._scripts: dict[str, str] = {}
+
+        self.log_router = LogStreamRouter(self)
+
     async def connect(self):
         """Connect to Redis."""
-        logger.info(f"Connecting to Redis: {settings.redis_host}:{settings.redis_port}")
+        logger.info("Connecting to Redis: %s:%s", settings.redis_host, settings.redis_port)
 
-        self.client = await redis.from_url(
+        # Blocking pool: once every connection is checked out, callers wait
+        # for one to free up instead of failing with "Too many connections"
+        self._pool = redis.BlockingConnectionPool.from_url(
             self.url,
             max_connections=self.max_connections,
-            decode_responses=True,
+            timeout=settings.redis_pool_timeout,
+            # Replies stay as bytes: msgpack/orjson parse them directly and
+            # only values handed back as str are decoded explicitly
+            decode_responses=False,
         )
+        self.client = redis.Redis(connection_pool=self._pool)
 
         # Test connection
         await self.client.ping()
@@ -43,12 +126,53 @@ class RedisAdapter:
 
     async def close(self):
         """Close Redis connection."""
+        if self._publisher:
+            await self._pub_queue.join()
+            self._publisher.cancel()
+            try:
+                await self._publisher
+            except asyncio.CancelledError:
+                pass
+            self._publisher = None
+        await self.log_router.close()
         if self.client:
             await self.client.close()
-            logger.info("Redis connection closed")
+        if self._pool:
+            # The client doesn't own a pool passed in explicitly
+            await self._pool.disconnect()
+        logger.info("Redis connection closed")
 
     # Task state caching
 
+    def _encode_task(self, task_data: dict) -> bytes:
+        """Serialize task state, compressing payloads above the threshold."""
+        packed = self._packer.pack(task_data)
+        if len(packed) > self._compress_threshold:
+            return TASK_FORMAT_ZSTD + self._zctx.compress(packed)
+        return TASK_FORMAT_MSGPACK + packed
+
+    def _decode_task(self, data: bytes) -> Optional[dict]:
+        """Deserialize task state written by _encode_task.
+
+        Entries that can't be decoded (e.g. JSON left over from before the
+        msgpack format) are treated as cache misses rather than errors.
+        """
+        tag = data[:1]
+        try:
+            if tag == TASK_FORMAT_ZSTD:
+                task_data = msgpack.unpackb(self._zdctx.decompress(data[1:]), raw=False)
+            elif tag == TASK_FORMAT_MSGPACK:
+                task_data = msgpack.unpackb(data[1:], raw=False)
+            else:
+                task_data = msgpack.unpackb(data, raw=False)
+        except (ValueError, zstd.ZstdError, msgpack.UnpackException):
+            task_data = None
+
+        if not isinstance(task_data, dict):
+            logger.warning("Ignoring undecodable cached task state (%d bytes)", len(data))
+            return None
+        return task_data
+
     async def get_task(self, task_id: str) -> Optional[dict]:
         """Get task state from Redis cache.
 
@@ -60,7 +184,21 @@ class RedisAdapter:
         """
         key = f"task:{task_id}"
         data = await self.client.get(key)
-        return json.loads(data) if data else None
+        return self._decode_task(data) if data else None
+
+    async def get_tasks(self, task_ids: list[str]) -> list[Optional[dict]]:
+        """Get several task states from Redis cache in one round-trip.
+
+        Args:
+            task_ids: Task IDs
+
+        Returns:
+            Task data dicts in ID order, None for tasks not cached
+        """
+        if not task_ids:
+            return []
+        values = await self.client.mget([f"task:{task_id}" for task_id in task_ids])
+        return [self._decode_task(data) if data else None for data in values]
 
     async def set_task(self, task_id: str, task_data: dict, ttl: int = None):
         """Cache task state.
@@ -71,10 +209,32 @@ class RedisAdapter:
             ttl: Time-to-live in seconds (default: settings.task_cache_ttl)
         """
         if ttl is None:
-            ttl = settings.task_cache_ttl
+            ttl = self._task_cache_ttl
 
         key = f"task:{task_id}"
-        await self.client.setex(key, ttl, json.dumps(task_data))
+        await self.client.setex(key, ttl, self._encode_task(task_data))
+
+    async def get_task_bundle(self, task_id: str, log_limit: int = 100) -> dict:
+        """Get task state, collaborating agents, and recent logs in one round-trip.
+
+        Args:
+            task_id: Task ID
+            log_limit: Maximum number of logs to return
+
+        Returns:
+            Dict with "task" (None if not cached), "agents", and "logs"
+        """
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(f"task:{task_id}")
+        pipe.smembers(f"collaboration:{task_id}")
+        pipe.xrevrange(log_stream_key(task_id), count=log_limit)
+        task_data, agents, logs = await pipe.execute()
+
+        return {
+            "task": self._decode_task(task_data) if task_data else None,
+            "agents": [agent.decode() for agent in agents] if agents else [],
+            "logs": [_loads(fields[LOG_ENTRY_FIELD]) for _entry_id, fields in logs],
+        }
 
     async def delete_task(self, task_id: str):
         """Delete task from cache.
@@ -98,7 +258,7 @@ class RedisAdapter:
         """
         key = f"task:{task_id}:files"
         files = await self.client.smembers(key)
-        return list(files) if files else []
+        return [f.decode() for f in files] if files else []
 
     async def add_task_file(self, task_id: str, file_path: str):
         """Add file to task's file list.
@@ -108,8 +268,10 @@ class RedisAdapter:
             file_path: File path
         """
         key = f"task:{task_id}:files"
-        await self.client.sadd(key, file_path)
-        await self.client.expire(key, settings.task_cache_ttl)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.sadd(key, file_path)
+        pipe.expire(key, self._task_cache_ttl)
+        await pipe.execute()
 
     # File locks
 
@@ -123,7 +285,8 @@ class RedisAdapter:
             Task ID of lock owner or None if unlocked
         """
         lock_key = f"lock:file:{file_path}"
-        return await self.client.get(lock_key)
+        owner = await self.client.get(lock_key)
+        return owner.decode() if owner is not None else None
 
     async def set(
         self, key: str, value: str, nx: bool = False, ex: int = None
@@ -150,7 +313,30 @@ class RedisAdapter:
         Returns:
             Value or None if key doesn't exist
         """
-        return await self.client.get(key)
+        value = await self.client.get(key)
+        return value.decode() if value is not None else None
+
+    async def mget(self, keys: list[str]) -> list[Optional[str]]:
+        """Get several Redis key values in one round-trip.
+
+        Args:
+            keys: Redis keys
+
+        Returns:
+            Values in key order, None for keys that don't exist
+        """
+        values = await self.client.mget(keys)
+        return [value.decode() if value is not None else None for value in values]
+
+    async def setex(self, key: str, seconds: int, value: str):
+        """Set Redis key with an expiry.
+
+        Args:
+            key: Redis key
+            seconds: Expiry time in seconds
+            value: Value to set
+        """
+        await self.client.setex(key, seconds, value)
 
     async def delete(self, key: str):
         """Delete Redis key.
@@ -160,6 +346,14 @@ class RedisAdapter:
         """
         await self.client.delete(key)
 
+    async def unlink(self, *keys: str):
+        """Delete Redis keys in one call, reclaiming memory in the background.
+
+        Args:
+            keys: Redis keys
+        """
+        await self.client.unlink(*keys)
+
     # Execution logs
 
     async def get_logs(self, task_id: str, limit: int = 100) -> list[dict]:
@@ -172,9 +366,8 @@ class RedisAdapter:
         Returns:
             List of log entries (most recent first)
         """
-        log_key = f"logs:{task_id}"
-        logs = await self.client.lrange(log_key, 0, limit - 1)
-        return [json.loads(log) for log in logs] if logs else []
+        entries = await self.client.xrevrange(log_stream_key(task_id), count=limit)
+        return [_loads(fields[LOG_ENTRY_FIELD]) for _entry_id, fields in entries]
 
     async def lpush(self, key: str, value: str):
         """Push value to head of Redis list.
@@ -194,9 +387,54 @@ class RedisAdapter:
         """
         await self.client.expire(key, seconds)
 
+    def pipeline(self, transaction: bool = False):
+        """Get a Redis pipeline for batching commands into one round-trip.
+
+        Args:
+            transaction: Wrap queued commands in MULTI/EXEC
+
+        Returns:
+            Redis pipeline
+        """
+        return self.client.pipeline(transaction=transaction)
+
+    # Scripting
+
+    def register_script(self, script: str) -> str:
+        """Register a Lua script for eval_sha.
+
+        The SHA1 is computed locally, so no round-trip is needed; the server
+        caches the script on first use.
+
+        Args:
+            script: Lua source
+
+        Returns:
+            Script SHA1 digest
+        """
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        self._scripts[sha] = script
+        return sha
+
+    async def eval_sha(self, sha: str, keys: list[str], args: list) -> Any:
+        """Run a registered Lua script by SHA, sending the source on NOSCRIPT.
+
+        Args:
+            sha: Digest returned by register_script()
+            keys: Redis keys the script touches
+            args: Script arguments
+
+        Returns:
+            Script result
+        """
+        try:
+            return await self.client.evalsha(sha, len(keys), *keys, *args)
+        except NoScriptError:
+            return await self.client.eval(self._scripts[sha], len(keys), *keys, *args)
+
     # Pub/sub
 
-    async def publish(self, channel: str, message: str):
+    async def publish(self, channel: str, message: str | bytes):
         """Publish message to Redis channel.
 
         Args:
@@ -205,6 +443,44 @@ class RedisAdapter:
         """
         await self.client.publish(channel, message)
 
+    async def publish_nowait(self, channel: str, message: str | bytes):
+        """Publish a notification without waiting for Redis to reply.
+
+        For notifications whose delivery count nobody reads. Messages are
+        queued and sent in order by a background task; the caller only
+        waits when MAX_PENDING_PUBLISHES are already queued. Failures are
+        logged rather than raised.
+
+        Args:
+            channel: Channel name
+            message: Message to publish
+        """
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.create_task(self._publish_loop())
+
+        await self._pub_queue.put((channel, message))
+
+    async def _publish_loop(self):
+        """Send queued notifications, pipelining whatever has piled up."""
+        while True:
+            batch = [await self._pub_queue.get()]
+            if self._pub_queue.empty():
+                # Give a burst (e.g. agents joining together) a moment to pile up
+                await asyncio.sleep(PUBLISH_COALESCE_DELAY)
+            while not self._pub_queue.empty() and len(batch) < MAX_PUBLISH_BATCH:
+                batch.append(self._pub_queue.get_nowait())
+
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for channel, message in batch:
+                    pipe.publish(channel, message)
+                await pipe.execute()
+            except Exception as e:
+                logger.error("Background publish failed (%d messages): %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._pub_queue.task_done()
+
     async def keys(self, pattern: str) -> list[str]:
         """Get all keys matching pattern.
 
@@ -217,6 +493,19 @@ class RedisAdapter:
         keys = await self.client.keys(pattern)
         return [key.decode() if isinstance(key, bytes) else key for key in keys]
 
+    async def scan_iter(self, match: str, count: int = 500):
+        """Iterate keys matching pattern with incremental SCAN (non-blocking, unlike KEYS).
+
+        Args:
+            match: Key pattern (e.g., "task:*")
+            count: SCAN batch size hint
+
+        Yields:
+            Matching keys
+        """
+        async for key in self.client.scan_iter(match=match, count=count):
+            yield key.decode()
+
     def pubsub(self):
         """Get Redis pub/sub client.
 
@@ -236,7 +525,8 @@ class RedisAdapter:
         Returns:
             Set of members
         """
-        return await self.client.smembers(key)
+        members = await self.client.smembers(key)
+        return {m.decode() for m in members}
 
     async def sadd(self, key: str, *values: str):
         """Add members to a Redis set.
@@ -255,3 +545,179 @@ class RedisAdapter:
             values: Values to remove
         """
         await self.client.srem(key, *values)
+
+
+def train_task_dictionary(samples: list[dict], dict_size: int = 100_000) -> bytes:
+    """Train a zstd dictionary for task state from sample payloads.
+
+    Write the result to a file and point TASK_ZSTD_DICT_PATH at it. Entries
+    compressed with one dictionary cannot be read with another, so swap
+    dictionaries only alongside a cache flush.
+
+    Args:
+        samples: Representative task data dictionaries
+        dict_size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes
+    """
+    packer = msgpack.Packer(use_bin_type=True)
+    return zstd.train_dictionary(dict_size, [packer.pack(s) for s in samples]).as_bytes()
+
+
+class LogStreamRouter:
+    """Shares one blocking XREAD across in-process log stream readers.
+
+    Streams are reference-counted by the number of local subscribers: the
+    first local subscriber adds the stream to the shared read, starting
+    after its newest entry; the last one to leave drops it. A single
+    listener task decodes each entry once and fans it out to every local
+    queue.
+
+    Queues are bounded: a subscriber that falls LOG_SUBSCRIBER_QUEUE_SIZE
+    entries behind is dropped and receives LOG_STREAM_END, as every
+    subscriber does when the router closes.
+    """
+
+    def __init__(self, redis_adapter: RedisAdapter):
+        """Initialize log stream router.
+
+        Args:
+            redis_adapter: Redis cache adapter
+        """
+        self.redis = redis_adapter
+        self._listener: Optional[asyncio.Task] = None
+        self._subs: dict[str, set[asyncio.Queue]] = {}
+        self._last_ids: dict[str, bytes] = {}
+        self._subscribed = asyncio.Event()
+        self._closing = False
+
+    async def _listen(self):
+        """Route new stream entries to local subscriber queues.
+
+        Blocks for at most a second per read, so streams subscribed while a
+        read is in flight are picked up on the next one; their start IDs are
+        fixed at subscribe time, so no entries are skipped meanwhile.
+        """
+        # Checked as well as relying on cancellation, which the client can lose
+        # if it lands just as a blocking read starts
+        while not self._closing:
+            if not self._last_ids:
+                self._subscribed.clear()
+                await self._subscribed.wait()
+                continue
+
+            read_ids = dict(self._last_ids)
+            try:
+                response = await self.redis.client.xread(
+                    read_ids, count=LOG_STREAM_READ_COUNT, block=1000
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Log stream router read failed: %s", e)
+                await asyncio.sleep(1)
+                continue
+
+            for stream, entries in response or ():
+                stream_key = stream.decode()
+                queues = self._subs.get(stream_key)
+                # Skip streams dropped during the read, or dropped and subscribed
+                # again from a newer start ID, which the next read covers
+                if not queues or self._last_ids.get(stream_key) != read_ids[stream_key]:
+                    continue
+
+                self._last_ids[stream_key] = entries[-1][0]
+                lagging = set()
+                for _entry_id, fields in entries:
+                    data = _loads(fields[LOG_ENTRY_FIELD])
+                    for queue in queues - lagging:
+                        try:
+                            queue.put_nowait(data)
+                        except asyncio.QueueFull:
+                            lagging.add(queue)
+
+                for queue in lagging:
+                    logger.warning(
+                        "Log stream subscriber fell behind on %s; dropping it", stream_key
+                    )
+                    self._drop(stream_key, queue)
+                    _end(queue)
+
+    async def subscribe(self, stream_key: str) -> asyncio.Queue:
+        """Register a local subscriber for a log stream.
+
+        Args:
+            stream_key: Stream key (e.g., logstream:task-123)
+
+        Returns:
+            Queue receiving decoded entries added to the stream from now on
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=LOG_SUBSCRIBER_QUEUE_SIZE)
+        if self._closing:
+            _end(queue)
+            return queue
+
+        # Registered before any await, so a close() meanwhile still ends it
+        queues = self._subs.get(stream_key)
+        if queues is not None:
+            queues.add(queue)
+        else:
+            # First local subscriber: read from the stream's current tail
+            self._subs[stream_key] = queues = {queue}
+            newest = await self.redis.client.xrevrange(stream_key, count=1)
+            if self._subs.get(stream_key) is queues:
+                self._last_ids[stream_key] = newest[0][0] if newest else b"0-0"
+                self._subscribed.set()
+                logger.debug("Log stream router following %s", stream_key)
+
+        if self._listener is None and not self._closing:
+            self._listener = asyncio.create_task(self._listen())
+
+        return queue
+
+    async def unsubscribe(self, stream_key: str, queue: asyncio.Queue):
+        """Remove a local subscriber.
+
+        Args:
+            stream_key: Stream key
+            queue: Queue returned by subscribe()
+        """
+        self._drop(stream_key, queue)
+
+    def _drop(self, stream_key: str, queue: asyncio.Queue):
+        """Forget a subscriber queue, and the stream with its last subscriber."""
+        queues = self._subs.get(stream_key)
+        if queues is None or queue not in queues:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            # Last local subscriber gone: stop reading the stream
+            del self._subs[stream_key]
+            self._last_ids.pop(stream_key, None)
+            logger.debug("Log stream router dropped %s", stream_key)
+
+    async def close(self):
+        """Stop the listener and end every subscriber's stream."""
+        self._closing = True
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        for queues in self._subs.values():
+            for queue in queues:
+                _end(queue)
+        self._subs.clear()
+        self._last_ids.clear()
+
+
+def _end(queue: asyncio.Queue):
+    """Put LOG_STREAM_END on a subscriber queue, dropping its oldest entry if it is full."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(LOG_STREAM_END)
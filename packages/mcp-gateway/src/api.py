@@ -6,9 +6,10 @@ the MCP protocol directly (which requires stdio transport).
 
 import asyncio
 import logging
-from typing import Dict, List
+from typing import Any, Dict, List
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.adapters.redis import RedisAdapter
@@ -31,6 +32,8 @@ app = FastAPI(
 # Global adapters and tools (initialized on startup)
 redis_adapter: RedisAdapter = None
 postgres_adapter: PostgresAdapter = None
+file_provider: FileResourceProvider = None
+log_provider: LogResourceProvider = None
 file_tools: FileOperationTools = None
 collab_tools: CollaborationTools = None
 sync_tasks: List[asyncio.Task] = []
@@ -58,6 +61,13 @@ class ClaimFileRequest(BaseModel):
     timeout_sec: int = 60
 
 
+class ClaimFilesRequest(BaseModel):
+    task_id: str
+    paths: List[str]
+    timeout_sec: int = 60
+    all_or_nothing: bool = False
+
+
 class ReleaseFileRequest(BaseModel):
     task_id: str
     path: str
@@ -85,23 +95,22 @@ class CollaborationRequest(BaseModel):
 @app.on_event("startup")
 async def startup():
     """Initialize adapters and tools on startup."""
-    global redis_adapter, postgres_adapter, file_tools, collab_tools, sync_tasks
+    global redis_adapter, postgres_adapter, file_provider, log_provider
+    global file_tools, collab_tools, sync_tasks
 
     logger.info("Initializing MCP Gateway API...")
 
-    # Initialize adapters
+    # Initialize adapters (connected concurrently; Postgres only feeds the sync tasks)
     redis_adapter = RedisAdapter()
-    await redis_adapter.connect()
-    logger.info("Redis adapter connected")
-
     postgres_adapter = PostgresAdapter(redis_adapter)
-    await postgres_adapter.connect()
-    logger.info("PostgreSQL adapter connected")
+    await asyncio.gather(redis_adapter.connect(), postgres_adapter.connect())
+    logger.info("Redis and PostgreSQL adapters connected")
 
     # Initialize resource providers
-    task_provider = TaskResourceProvider(redis_adapter, postgres_adapter)
+    task_provider = TaskResourceProvider(redis_adapter)
     file_provider = FileResourceProvider(redis_adapter)
     log_provider = LogResourceProvider(redis_adapter)
+    log_provider.start()
     logger.info("Resource providers initialized")
 
     # Initialize tool providers
@@ -122,7 +131,7 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Close connections on shutdown."""
-    global redis_adapter, postgres_adapter, sync_tasks
+    global redis_adapter, postgres_adapter, log_provider, sync_tasks
 
     logger.info("Shutting down MCP Gateway API...")
 
@@ -135,6 +144,10 @@ async def shutdown():
             pass
     logger.info("Sync tasks cancelled")
 
+    # Flush queued log steps before Redis goes away
+    if log_provider:
+        await log_provider.close()
+
     # Close adapters
     if postgres_adapter:
         await postgres_adapter.close()
@@ -150,7 +163,7 @@ async def shutdown():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check() -> dict[str, Any]:
     """Health check endpoint."""
     return {"status": "healthy", "version": "1.0.0"}
 
@@ -161,7 +174,7 @@ async def health_check():
 
 
 @app.post("/tools/file_read")
-async def api_file_read(request: FileReadRequest):
+async def api_file_read(request: FileReadRequest) -> dict[str, Any]:
     """Read file via MCP tools."""
     try:
         result = await file_tools.file_read(request.task_id, request.path)
@@ -172,7 +185,7 @@ async def api_file_read(request: FileReadRequest):
 
 
 @app.post("/tools/file_write")
-async def api_file_write(request: FileWriteRequest):
+async def api_file_write(request: FileWriteRequest) -> dict[str, Any]:
     """Write file via MCP tools."""
     try:
         result = await file_tools.file_write(
@@ -188,7 +201,7 @@ async def api_file_write(request: FileWriteRequest):
 
 
 @app.post("/tools/claim_file")
-async def api_claim_file(request: ClaimFileRequest):
+async def api_claim_file(request: ClaimFileRequest) -> dict[str, Any]:
     """Acquire file lock via MCP tools."""
     try:
         result = await file_tools.claim_file(
@@ -202,8 +215,20 @@ async def api_claim_file(request: ClaimFileRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/tools/claim_files")
+async def api_claim_files(request: ClaimFilesRequest) -> dict[str, Any]:
+    """Acquire several file locks in one round-trip via MCP tools."""
+    try:
+        return await file_tools.claim_files(
+            request.task_id, request.paths, request.timeout_sec, request.all_or_nothing
+        )
+    except Exception as e:
+        logger.error(f"Lock claim error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/tools/release_file")
-async def api_release_file(request: ReleaseFileRequest):
+async def api_release_file(request: ReleaseFileRequest) -> dict[str, Any]:
     """Release file lock via MCP tools."""
     try:
         result = await file_tools.release_file(request.task_id, request.path)
@@ -219,7 +244,7 @@ async def api_release_file(request: ReleaseFileRequest):
 
 
 @app.post("/tools/log_step")
-async def api_log_step(request: LogStepRequest):
+async def api_log_step(request: LogStepRequest) -> dict[str, Any]:
     """Log execution step via MCP tools."""
     try:
         result = await collab_tools.log_step(request.task_id, request.step)
@@ -230,7 +255,7 @@ async def api_log_step(request: LogStepRequest):
 
 
 @app.post("/tools/subscribe_logs")
-async def api_subscribe_logs(request: SubscribeLogsRequest):
+async def api_subscribe_logs(request: SubscribeLogsRequest) -> dict[str, Any]:
     """Subscribe to real-time logs."""
     try:
         result = await collab_tools.subscribe_logs(request.task_id)
@@ -241,7 +266,7 @@ async def api_subscribe_logs(request: SubscribeLogsRequest):
 
 
 @app.post("/tools/join_collaboration")
-async def api_join_collaboration(request: CollaborationRequest):
+async def api_join_collaboration(request: CollaborationRequest) -> dict[str, Any]:
     """Join task collaboration."""
     try:
         result = await collab_tools.join_collaboration(
@@ -254,7 +279,7 @@ async def api_join_collaboration(request: CollaborationRequest):
 
 
 @app.post("/tools/leave_collaboration")
-async def api_leave_collaboration(request: CollaborationRequest):
+async def api_leave_collaboration(request: CollaborationRequest) -> dict[str, Any]:
     """Leave task collaboration."""
     try:
         result = await collab_tools.leave_collaboration(
@@ -272,7 +297,7 @@ async def api_leave_collaboration(request: CollaborationRequest):
 
 
 @app.get("/resources/tasks/{task_id}/state")
-async def api_get_task_state(task_id: str):
+async def api_get_task_state(task_id: str) -> dict[str, Any]:
     """Get task state resource."""
     try:
         task_data = await redis_adapter.get_task(task_id)
@@ -284,8 +309,25 @@ async def api_get_task_state(task_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/resources/tasks/{task_id}/bundle")
+async def api_get_task_bundle(task_id: str) -> dict[str, Any]:
+    """Get task state, collaborating agents, and recent logs together.
+
+    Replaces three sequential requests with a single pipelined Redis batch.
+    """
+    try:
+        bundle = await redis_adapter.get_task_bundle(task_id)
+    except Exception as e:
+        logger.error(f"Get task bundle error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not bundle["task"]:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    return {"task_id": task_id, **bundle}
+
+
 @app.get("/resources/collaboration/{task_id}")
-async def api_get_collaborating_agents(task_id: str):
+async def api_get_collaborating_agents(task_id: str) -> dict[str, Any]:
     """Get collaborating agents for task."""
     try:
         result = await collab_tools.get_collaborating_agents(task_id)
@@ -293,3 +335,24 @@ async def api_get_collaborating_agents(task_id: str):
     except Exception as e:
         logger.error(f"Get collaborating agents error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/resources/files/{task_id}/{path:path}")
+async def api_get_file(task_id: str, path: str):
+    """Stream workspace file content.
+
+    Streamed in chunks from the descriptor opened beneath the workspace
+    (no symlinks followed), so large files are never buffered or
+    JSON-encoded in the gateway process.
+    """
+    try:
+        chunks = await file_provider.open_stream(task_id, path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File not found: {path}")
+    except Exception as e:
+        logger.error(f"Get file error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(chunks, media_type="text/plain")
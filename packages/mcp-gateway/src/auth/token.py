@@ -1,16 +1,30 @@
 """JWT token authentication for MCP clients."""
 
+import hashlib
+import hmac
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime
 from typing import Optional
 
 import jwt
-from pydantic import BaseModel
+import orjson
+import pybase64
+from pydantic import BaseModel, ValidationError
 
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of verified tokens kept in memory
+VERIFY_CACHE_SIZE = 10_000
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment (SIMD-accelerated via pybase64)."""
+    return pybase64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
 
 class TokenPayload(BaseModel):
     """JWT token payload."""
@@ -28,6 +42,13 @@ class TokenManager:
         self.algorithm = settings.jwt_algorithm
         self.expiration = settings.jwt_expiration
 
+        # HMAC key bytes, encoded once for the HS256 fast path
+        self._secret_bytes = self.secret.encode()
+
+        # Verified tokens: raw token -> (exp timestamp, payload), LRU ordered
+        self._cache: OrderedDict[str, tuple[float, TokenPayload]] = OrderedDict()
+        self._cache_owner = (self.secret, self.algorithm)
+
     def create_token(self, agent_id: str) -> str:
         """Create JWT token for agent.
 
@@ -37,9 +58,10 @@ class TokenManager:
         Returns:
             JWT token string
         """
+        # Integer epoch: PyJWT takes it as-is instead of converting a datetime
         payload = {
             "agent_id": agent_id,
-            "exp": datetime.utcnow() + timedelta(seconds=self.expiration),
+            "exp": int(time.time()) + self.expiration,
         }
 
         token = jwt.encode(payload, self.secret, algorithm=self.algorithm)
@@ -50,15 +72,44 @@ class TokenManager:
     def verify_token(self, token: str) -> Optional[TokenPayload]:
         """Verify JWT token.
 
+        Successful verifications are cached until the token expires, so
+        repeat calls with the same token skip signature checking.
+
         Args:
             token: JWT token string
 
         Returns:
             Token payload if valid, None otherwise
         """
+        # Drop cached results if the secret or algorithm was rotated
+        if self._cache_owner != (self.secret, self.algorithm):
+            self._cache.clear()
+            self._cache_owner = (self.secret, self.algorithm)
+            self._secret_bytes = self.secret.encode()
+
+        cached = self._cache.get(token)
+        if cached is not None:
+            exp, payload = cached
+            if exp > time.time():
+                self._cache.move_to_end(token)
+                return payload
+
+            del self._cache[token]
+            logger.warning("Token expired")
+            return None
+
         try:
-            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
-            return TokenPayload(**payload)
+            if self.algorithm == "HS256":
+                decoded = self._decode_hs256(token)
+            else:
+                decoded = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+            payload = TokenPayload(**decoded)
+
+            self._cache[token] = (payload.exp.timestamp(), payload)
+            if len(self._cache) > VERIFY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+            return payload
 
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
@@ -68,6 +119,60 @@ class TokenManager:
             logger.warning(f"Invalid token: {e}")
             return None
 
+        except ValidationError as e:
+            # Validly signed, but missing agent_id/exp or with the wrong types
+            logger.warning(f"Invalid token claims: {e.error_count()} error(s)")
+            return None
+
+    def _decode_hs256(self, token: str) -> dict:
+        """Verify and decode an HS256 token without going through PyJWT.
+
+        Checks the signature with hashlib's OpenSSL-backed HMAC-SHA256
+        (SHA-NI accelerated where available) against the precomputed key,
+        then validates the exp/nbf claims the same way jwt.decode does.
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            Decoded claims
+
+        Raises:
+            jwt.InvalidTokenError: If the token is malformed, signed with a
+                different algorithm or key, expired, or not yet valid
+        """
+        try:
+            signing_input, _, signature_b64 = token.encode("ascii").rpartition(b".")
+            header_b64, _, payload_b64 = signing_input.partition(b".")
+            header = orjson.loads(_b64url_decode(header_b64))
+            signature = _b64url_decode(signature_b64)
+            claims = orjson.loads(_b64url_decode(payload_b64))
+        except ValueError as e:
+            raise jwt.DecodeError(f"Invalid token encoding: {e}")
+
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise jwt.DecodeError("Invalid token segments")
+        if header.get("alg") != "HS256":
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+        expected = hmac.new(self._secret_bytes, signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, signature):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+
+        now = time.time()
+        if "exp" in claims:
+            if not isinstance(claims["exp"], (int, float)):
+                raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+            if claims["exp"] <= now:
+                raise jwt.ExpiredSignatureError("Signature has expired")
+        if "nbf" in claims:
+            if not isinstance(claims["nbf"], (int, float)):
+                raise jwt.DecodeError("Not Before claim (nbf) must be an integer.")
+            if claims["nbf"] > now:
+                raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+
+        return claims
+
     def refresh_token(self, token: str) -> Optional[str]:
         """Refresh JWT token.
 
@@ -31,17 +31,33 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_password: str | None = None
     redis_max_connections: int = 50
+    redis_pool_timeout: float = 5.0  # seconds to wait for a free pooled connection
 
     # Sync configuration
     sync_from_postgres_interval: float = 1.0  # seconds
     sync_to_postgres_interval: float = 5.0  # seconds
     sync_batch_size: int = 100
+    worker_concurrency: int = 8  # parallel Redis writers for sync/log fan-out
 
     # Cache configuration
     task_cache_ttl: int = 3600  # 1 hour
     log_stream_ttl: int = 3600  # 1 hour
     file_lock_timeout: int = 60  # seconds
 
+    # Task state compression (zstd, applied above the size threshold)
+    task_compress_threshold: int = 256  # bytes of packed task state
+    task_compress_level: int = 3
+    task_zstd_dict_path: str | None = None  # optional trained dictionary
+
+    # Log batching
+    log_flush_interval_ms: int = 50  # coalesce log_step writes for this long
+
+    # Backend API (shared HTTP/2 client)
+    api_url: str = "http://api:3001/api"
+    api_timeout: float = 30.0  # seconds
+    api_max_connections: int = 64
+    api_max_keepalive: int = 32
+
     # MCP configuration
     mcp_transport: str = "stdio"  # stdio or http
     mcp_server_name: str = "agent-collaboration-gateway"
@@ -1,12 +1,127 @@
 """File resource provider for MCP."""
 
+import asyncio
+import errno
 import json
 import logging
 import os
+import stat
 from pathlib import Path
+from typing import AsyncIterator
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed file reads
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+# Intermediate directories are opened without following symlinks
+_DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC
+
+
+def _split_relative(path: str) -> list[str]:
+    """Split a workspace-relative path, rejecting anything that could escape.
+
+    Args:
+        path: File path (relative to workspace tasks directory)
+
+    Returns:
+        Path components
+
+    Raises:
+        ValueError: If the path is absolute, empty, or contains ".."
+    """
+    parts = [p for p in path.split("/") if p not in ("", ".")]
+    if path.startswith("/") or not parts or ".." in parts:
+        raise ValueError(f"Path traversal attempt detected: {path}")
+    return parts
+
+
+def _open_beneath(root_fd: int, parts: list[str], flags: int, create_dirs: bool = False) -> int:
+    """Open a file beneath a directory fd without following any symlink.
+
+    Each component is opened relative to its parent's fd (openat) with
+    O_NOFOLLOW, so the file cannot resolve outside root_fd.
+
+    Args:
+        root_fd: Directory fd to resolve from
+        parts: Path components from _split_relative
+        flags: os.open flags for the final component
+        create_dirs: Create missing parent directories
+
+    Returns:
+        Open file descriptor
+
+    Raises:
+        OSError: ELOOP if any component is a symlink
+    """
+    dir_fd = root_fd
+    try:
+        for name in parts[:-1]:
+            if create_dirs:
+                try:
+                    os.mkdir(name, dir_fd=dir_fd)
+                except FileExistsError:
+                    pass
+            try:
+                next_fd = os.open(name, _DIR_FLAGS, dir_fd=dir_fd)
+            except NotADirectoryError:
+                # O_DIRECTORY reports a symlinked directory as ENOTDIR; make it ELOOP
+                # like a symlinked final component
+                mode = os.stat(name, dir_fd=dir_fd, follow_symlinks=False).st_mode
+                if stat.S_ISLNK(mode):
+                    raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), name)
+                raise
+            if dir_fd != root_fd:
+                os.close(dir_fd)
+            dir_fd = next_fd
+
+        return os.open(
+            parts[-1], flags | os.O_NOFOLLOW | os.O_CLOEXEC, 0o644, dir_fd=dir_fd
+        )
+    finally:
+        if dir_fd != root_fd:
+            os.close(dir_fd)
+
+
+def _read_text(root_fd: int, parts: list[str]) -> str:
+    """Read a UTF-8 text file (runs in a worker thread)."""
+    fd = _open_beneath(root_fd, parts, os.O_RDONLY)
+    with os.fdopen(fd, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _open_binary(root_fd: int, parts: list[str]):
+    """Open a file for binary reading (runs in a worker thread)."""
+    return os.fdopen(_open_beneath(root_fd, parts, os.O_RDONLY), "rb")
+
+
+def _write_text(root_fd: int, parts: list[str], content: str):
+    """Write a UTF-8 text file, creating parent directories (runs in a worker thread)."""
+    fd = _open_beneath(
+        root_fd, parts, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, create_dirs=True
+    )
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _file_error(e: OSError, file_path: str) -> Exception:
+    """Map an error from opening a workspace file to the one callers should see."""
+    if e.errno == errno.ELOOP:
+        return ValueError(f"Symlinks are not allowed: {file_path}")
+    if isinstance(e, (FileNotFoundError, IsADirectoryError, NotADirectoryError)):
+        return FileNotFoundError(f"File not found: {file_path}")
+    return e
+
+
+async def _iter_chunks(f, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield chunks from an open binary file, closing it when done."""
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
 
 class FileResourceProvider:
     """Provides workspace file resources via MCP.
@@ -24,17 +139,64 @@ class FileResourceProvider:
         self.redis = redis_adapter
         self.workspace_root = Path("/app/workspace")
 
-    async def read_resource(self, uri: str) -> str:
-        """Read file resource by URI.
+        self._tasks_dir = os.path.join(os.path.realpath(self.workspace_root), "tasks")
+
+        # Directory fd all reads/writes are opened relative to (lazily opened)
+        self._tasks_fd: int | None = None
+
+    def _root_fd(self) -> int:
+        """Get the workspace tasks directory fd, opening it on first use."""
+        if self._tasks_fd is None:
+            os.makedirs(self._tasks_dir, exist_ok=True)
+            self._tasks_fd = os.open(
+                self._tasks_dir, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC
+            )
+        return self._tasks_fd
+
+    def _drop_stale_root(self, root_fd: int) -> bool:
+        """Forget root_fd if the tasks directory was removed or replaced since it was opened.
+
+        The stale fd is left open rather than closed: a concurrent worker
+        thread may still be using it, and a closed fd number can be reused
+        for another directory.
+
+        Returns:
+            True if the next _root_fd() call will open the current directory
+        """
+        if root_fd != self._tasks_fd:
+            # Another call already replaced it
+            return True
+        try:
+            current = os.stat(self._tasks_dir)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(root_fd)
+        if current and (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+            return False
+
+        logger.warning("Workspace tasks directory was replaced; reopening it")
+        self._tasks_fd = None
+        return True
+
+    async def _beneath(self, func, *args):
+        """Run func(root_fd, *args) in a worker thread, retrying once on a stale root fd."""
+        root_fd = self._root_fd()
+        try:
+            return await asyncio.to_thread(func, root_fd, *args)
+        except OSError as e:
+            if e.errno not in (errno.ENOENT, errno.ESTALE) or not self._drop_stale_root(root_fd):
+                raise
+        return await asyncio.to_thread(func, self._root_fd(), *args)
+
+    def _parse_uri(self, uri: str) -> tuple[str, str]:
+        """Split a workspace URI into task ID and file path.
 
         Args:
             uri: Resource URI (e.g., workspace://task-123/calc.py)
 
         Returns:
-            File content
+            (task_id, file_path) tuple
         """
-        logger.info(f"Reading file resource: {uri}")
-
         # Parse URI: workspace://{taskId}/{path}
         if not uri.startswith("workspace://"):
             raise ValueError(f"Invalid workspace URI: {uri}")
@@ -43,35 +205,89 @@ class FileResourceProvider:
         if len(parts) < 2:
             raise ValueError(f"Invalid workspace URI format: {uri}")
 
-        task_id = parts[0]
-        file_path = parts[1]
+        return parts[0], parts[1]
 
-        # Validate task exists
+    async def _check_task(self, task_id: str):
+        """Raise ValueError if the task is not cached."""
         task_data = await self.redis.get_task(task_id)
         if not task_data:
             raise ValueError(f"Task not found: {task_id}")
 
-        # Construct full file path (task-scoped)
-        full_path = self.workspace_root / "tasks" / file_path
+    async def open_stream(
+        self, task_id: str, file_path: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Open a task-scoped file and return an iterator over its chunks.
 
-        # Security check: prevent path traversal
-        if not str(full_path.resolve()).startswith(str(self.workspace_root.resolve())):
-            raise ValueError(f"Path traversal attempt detected: {file_path}")
+        The file is opened beneath the workspace fd before this returns, so
+        a missing file raises here rather than partway through a response.
 
-        # Check if file exists
-        if not full_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        Args:
+            task_id: Task ID
+            file_path: File path (relative to workspace)
+            chunk_size: Bytes per chunk (default: 64 KiB)
+
+        Returns:
+            Async iterator of raw file content chunks
+        """
+        await self._check_task(task_id)
+        parts = _split_relative(file_path)
 
-        # Read file content
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            f = await self._beneath(_open_binary, parts)
+        except OSError as e:
+            raise _file_error(e, file_path)
+
+        return _iter_chunks(f, chunk_size)
+
+    async def read_resource(self, uri: str) -> str:
+        """Read file resource by URI.
+
+        Buffers the whole file; use read_resource_stream for large files.
+
+        Args:
+            uri: Resource URI (e.g., workspace://task-123/calc.py)
+
+        Returns:
+            File content
+        """
+        logger.info(f"Reading file resource: {uri}")
+
+        task_id, file_path = self._parse_uri(uri)
+        await self._check_task(task_id)
+        parts = _split_relative(file_path)
+
+        # Open beneath the workspace fd and read, off the event loop
+        try:
+            content = await self._beneath(_read_text, parts)
             logger.info(f"Read {len(content)} bytes from {file_path}")
             return content
+        except OSError as e:
+            error = _file_error(e, file_path)
+            if error is e:
+                logger.error(f"Error reading file {file_path}: {e}")
+            raise error
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
             raise
 
+    async def read_resource_stream(
+        self, uri: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream file resource content in fixed-size chunks.
+
+        Args:
+            uri: Resource URI (e.g., workspace://task-123/calc.py)
+            chunk_size: Bytes per chunk (default: 64 KiB)
+
+        Yields:
+            Raw file content chunks
+        """
+        logger.info(f"Streaming file resource: {uri}")
+
+        task_id, file_path = self._parse_uri(uri)
+        async for chunk in await self.open_stream(task_id, file_path, chunk_size):
+            yield chunk
+
     async def write_file(self, task_id: str, path: str, content: str) -> dict:
         """Write file content.
 
@@ -85,20 +301,17 @@ class FileResourceProvider:
         """
         logger.info(f"Writing file for task {task_id}: {path}")
 
-        # Construct full file path
-        full_path = self.workspace_root / "tasks" / path
-
-        # Security check
-        if not str(full_path.resolve()).startswith(str(self.workspace_root.resolve())):
-            raise ValueError(f"Path traversal attempt detected: {path}")
-
-        # Create parent directories
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        # Reject paths that could leave the workspace
+        parts = _split_relative(path)
 
-        # Write file
+        # Write file (and create parent directories) off the event loop
         try:
-            with open(full_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            try:
+                await self._beneath(_write_text, parts, content)
+            except OSError as e:
+                if e.errno == errno.ELOOP:
+                    raise ValueError(f"Symlinks are not allowed: {path}")
+                raise
 
             # Track file in Redis
             await self.redis.add_task_file(task_id, path)
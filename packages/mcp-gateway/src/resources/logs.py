@@ -1,11 +1,36 @@
 """Log resource provider for MCP."""
 
-import json
+import asyncio
 import logging
-from typing import AsyncIterator
+import os
+from collections import defaultdict
+from typing import AsyncIterator, Optional
+
+import orjson
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from src.adapters.redis import (
+    LOG_ENTRY_FIELD,
+    LOG_STREAM_END,
+    LOG_STREAM_MAXLEN,
+    log_channel,
+    log_stream_key,
+)
+from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+_dumps = orjson.dumps
+
+# Cap on queued log steps per task, including ones requeued after a failed
+# write; the oldest are dropped past it so a Redis outage can't grow it forever
+MAX_QUEUED_LOG_STEPS = 10_000
+
+# Write errors worth retrying on the next flush; anything else (e.g. a
+# WRONGTYPE reply) would fail the same way again, so those steps are dropped
+TRANSIENT_WRITE_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
 
 class LogResourceProvider:
     """Provides execution log streaming via MCP.
@@ -22,6 +47,168 @@ class LogResourceProvider:
             redis_adapter: Redis cache adapter
         """
         self.redis = redis_adapter
+        self._log_stream_ttl = settings.log_stream_ttl
+        self._flush_interval = settings.log_flush_interval_ms / 1000
+        self._flush_workers = min(settings.worker_concurrency, os.cpu_count() or 1)
+
+        # Pending log entries per task as (payload, already published) pairs,
+        # drained by the background flusher
+        self._queue: dict[str, list[tuple[bytes, bool]]] = defaultdict(list)
+        self._pending = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+        # Held for the whole of a flush so close() never interrupts a write
+        self._flush_lock = asyncio.Lock()
+
+    def start(self):
+        """Start the background log flusher."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+            logger.info("Log flusher started")
+
+    async def close(self):
+        """Stop the background flusher and write out any queued entries.
+
+        A flush already in progress is allowed to finish first.
+        """
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        if self._queue:
+            logger.error(
+                "Dropped %d unwritten log step(s) on close",
+                sum(len(steps) for steps in self._queue.values()),
+            )
+            self._queue.clear()
+        logger.info("Log flusher stopped")
+
+    async def _flush_loop(self):
+        """Coalesce queued log steps and write them every flush interval."""
+        while True:
+            await self._pending.wait()
+            await asyncio.sleep(self._flush_interval)
+
+            try:
+                # Shielded: cancelling the loop must not abandon a batch mid-write
+                await asyncio.shield(self.flush())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error flushing log steps: %s", e, exc_info=True)
+
+    async def flush(self):
+        """Write all queued log steps as pipelined batches.
+
+        Tasks are spread across up to worker_concurrency pipelines sent
+        concurrently. Each entry is one XADD to the task's capped log
+        stream, which both stores it and wakes stream readers, plus a
+        PUBLISH on the task's log channel for pub/sub subscribers, followed
+        by one EXPIRE per task; a task's entries always share a pipeline,
+        so their order is preserved.
+
+        Steps whose XADD (or whole pipeline) fails with a connection error
+        or timeout are put back at the front of their task's queue and
+        retried on the next flush, without publishing them again if that
+        already succeeded. Steps failing with any other error are dropped.
+        """
+        async with self._flush_lock:
+            self._pending.clear()
+            if not self._queue:
+                return
+
+            batch, self._queue = self._queue, defaultdict(list)
+
+            items = list(batch.items())
+            workers = min(self._flush_workers, len(items))
+            groups = [items[i::workers] for i in range(workers)]
+            results = await asyncio.gather(
+                *(self._write_logs(group) for group in groups),
+                return_exceptions=True,
+            )
+
+            for group, result in zip(groups, results):
+                if isinstance(result, TRANSIENT_WRITE_ERRORS):
+                    logger.warning("Error writing log steps, will retry: %s", result)
+                    self._requeue(dict(group))
+                elif isinstance(result, Exception):
+                    logger.error(
+                        "Dropping %d log step(s) after write error: %s",
+                        sum(len(steps) for _, steps in group), result,
+                    )
+                elif result:
+                    self._requeue(result)
+
+            logger.debug("Flushed log steps for %d task(s)", len(batch))
+
+    def _requeue(self, failed: dict[str, list[tuple[bytes, bool]]]):
+        """Put unwritten steps back ahead of newer ones, keeping each task's queue bounded."""
+        for task_id, steps in failed.items():
+            queued = steps + self._queue.get(task_id, [])
+            overflow = len(queued) - MAX_QUEUED_LOG_STEPS
+            if overflow > 0:
+                logger.error("Dropping %d oldest log step(s) for task %s", overflow, task_id)
+                queued = queued[overflow:]
+            self._queue[task_id] = queued
+        self._pending.set()
+
+    async def _write_logs(
+        self, items: list[tuple[str, list[tuple[bytes, bool]]]]
+    ) -> dict[str, list[tuple[bytes, bool]]]:
+        """Write queued log steps for a group of tasks in one pipeline.
+
+        Returns:
+            Steps to retry, by task ID: those whose XADD failed transiently
+        """
+        pipe = self.redis.pipeline()
+        for task_id, steps in items:
+            log_key = log_stream_key(task_id)
+            channel = log_channel(task_id)
+
+            for payload, published in steps:
+                pipe.xadd(
+                    log_key,
+                    {LOG_ENTRY_FIELD: payload},
+                    maxlen=LOG_STREAM_MAXLEN,
+                    approximate=True,
+                )
+                if not published:
+                    pipe.publish(channel, payload)
+            pipe.expire(log_key, self._log_stream_ttl)
+
+        # Replies come back in command order: XADD[, PUBLISH] per step, then EXPIRE
+        replies = iter(await pipe.execute(raise_on_error=False))
+        retry = defaultdict(list)
+        for task_id, steps in items:
+            dropped = 0
+            error = None
+            for payload, published in steps:
+                added = next(replies)
+                if not published:
+                    published = not isinstance(next(replies), Exception)
+                if isinstance(added, TRANSIENT_WRITE_ERRORS):
+                    retry[task_id].append((payload, published))
+                    error = added
+                elif isinstance(added, Exception):
+                    dropped += 1
+                    error = added
+            next(replies)
+
+            if dropped:
+                logger.error(
+                    "Dropping %d log step(s) for task %s: %s", dropped, task_id, error
+                )
+            if task_id in retry:
+                logger.warning(
+                    "Retrying %d log step(s) for task %s: %s",
+                    len(retry[task_id]), task_id, error,
+                )
+        return retry
 
     async def read_resource(self, uri: str) -> str:
         """Read log resource by URI.
@@ -32,7 +219,7 @@ class LogResourceProvider:
         Returns:
             Log entries as JSON array
         """
-        logger.info(f"Reading log resource: {uri}")
+        logger.info("Reading log resource: %s", uri)
 
         # Parse URI: logs://{taskId}[/stream]
         if not uri.startswith("logs://"):
@@ -44,21 +231,25 @@ class LogResourceProvider:
         if len(parts) == 1:
             # Get historical logs
             logs = await self.redis.get_logs(task_id)
-            return json.dumps({"task_id": task_id, "logs": logs})
+            return _dumps({"task_id": task_id, "logs": logs}).decode()
 
         elif len(parts) == 2 and parts[1] == "stream":
             # Return stream subscription info
-            return json.dumps({
+            return _dumps({
                 "task_id": task_id,
                 "stream": True,
-                "channel": f"logs:{task_id}:stream",
-            })
+                "channel": log_channel(task_id),
+                "stream_key": log_stream_key(task_id),
+            }).decode()
 
         else:
             raise ValueError(f"Invalid log URI format: {uri}")
 
     async def append_log(self, task_id: str, step: dict) -> dict:
-        """Append log step and broadcast.
+        """Queue log step for storage and broadcast.
+
+        The step is written to Redis by the background flusher; call
+        flush() to force it out immediately.
 
         Args:
             task_id: Task ID
@@ -67,18 +258,12 @@ class LogResourceProvider:
         Returns:
             Result dictionary
         """
-        logger.info(f"Appending log step for task {task_id}")
+        logger.info("Appending log step for task %s", task_id)
 
-        # Store in Redis list
-        log_key = f"logs:{task_id}"
-        await self.redis.lpush(log_key, json.dumps(step))
-        await self.redis.expire(log_key, 3600)  # 1 hour TTL
+        self._queue[task_id].append((_dumps(step), False))
+        self._pending.set()
+        self.start()
 
-        # Broadcast to subscribers
-        channel = f"logs:{task_id}:stream"
-        await self.redis.publish(channel, json.dumps(step))
-
-        logger.info(f"Log step appended and broadcast for task {task_id}")
         return {"success": True, "task_id": task_id}
 
     async def stream_logs(self, task_id: str) -> AsyncIterator[dict]:
@@ -88,24 +273,21 @@ class LogResourceProvider:
             task_id: Task ID
 
         Yields:
-            Log step dictionaries
+            Log step dictionaries, until the gateway shuts down or this
+            reader falls too far behind
         """
-        logger.info(f"Streaming logs for task {task_id}")
+        logger.info("Streaming logs for task %s", task_id)
 
-        # Subscribe to Redis pub/sub channel
-        channel = f"logs:{task_id}:stream"
-        pubsub = self.redis.client.pubsub()
+        # Share the process-wide stream reader instead of blocking a connection each
+        stream_key = log_stream_key(task_id)
+        router = self.redis.log_router
+        queue = await router.subscribe(stream_key)
+        logger.info("Subscribed to log stream: %s", stream_key)
 
         try:
-            await pubsub.subscribe(channel)
-            logger.info(f"Subscribed to log stream: {channel}")
-
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    data = json.loads(message["data"])
-                    yield data
+            while (entry := await queue.get()) is not LOG_STREAM_END:
+                yield entry
 
         finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-            logger.info(f"Unsubscribed from log stream: {channel}")
+            await router.unsubscribe(stream_key, queue)
+            logger.info("Unsubscribed from log stream: %s", stream_key)
@@ -1,14 +1,95 @@
 """Memory resource provider for MCP - Cross-task learning."""
 
-import json
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
 import httpx
+import orjson
+
+from src.adapters.http import create_api_client
 
 logger = logging.getLogger(__name__)
 
-# API URL for memory endpoints
-API_URL = "http://api:3001/api/memories"
+# Memory endpoints, relative to the API client's base_url
+MEMORIES_PATH = "/memories"
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Cache TTLs (seconds). Task-type entries are served without asking the API
+# for MEMORY_TYPE_TTL, then kept until MEMORY_TYPE_RETAIN_TTL so they can be
+# revalidated with If-None-Match instead of refetched.
+MEMORY_TYPE_TTL = 3600
+MEMORY_TYPE_RETAIN_TTL = 86400
+MEMORY_SEARCH_TTL = 300
+
+# In-process cache in front of Redis for hot lookups
+LOCAL_CACHE_SIZE = 256
+LOCAL_CACHE_TTL = 60.0  # seconds
+
+# Hash with body, etag and fresh_until (epoch seconds) fields
+MEMORY_TYPE_KEY_PREFIX = "memory:approved:"
+
+# Memory resources by task type (static, so built once at import)
+_MEMORY_RESOURCES: tuple[dict, ...] = (
+    {
+        "uri": "memory://file_creation",
+        "name": "File Creation Memories",
+        "description": "Approved patterns for file creation tasks",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "memory://bug_fix",
+        "name": "Bug Fix Memories",
+        "description": "Approved patterns for bug fixing tasks",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "memory://refactor",
+        "name": "Refactoring Memories",
+        "description": "Approved patterns for refactoring tasks",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "memory://test",
+        "name": "Testing Memories",
+        "description": "Approved patterns for testing tasks",
+        "mimeType": "application/json"
+    },
+)
+_MEMORY_TASK_TYPES: tuple[str, ...] = tuple(
+    resource["uri"][len("memory://"):] for resource in _MEMORY_RESOURCES
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_memory_uri(uri: str) -> tuple[str, str]:
+    """Parse memory://{taskType} or memory://search?keywords={keywords}.
+
+    Returns:
+        ("type", task_type) or ("search", keywords), keywords percent-decoded
+    """
+    if not uri.startswith("memory://"):
+        raise ValueError(f"Invalid memory resource URI: {uri}")
+
+    parts = urlsplit(uri)
+    if parts.netloc == "search":
+        return "search", parse_qs(parts.query).get("keywords", [""])[0]
+    return "type", parts.netloc
+
+
+def _search_cache_key(keywords: str) -> str:
+    """Build a stable, process-independent cache key for a keyword search.
+
+    Keywords are normalized (trimmed, lowercased, sorted) so equivalent
+    queries share one entry, then hashed with BLAKE2b.
+    """
+    normalized = ",".join(sorted(k.strip().lower() for k in keywords.split(",")))
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return f"memory:search:{digest}"
 
 
 class MemoryResourceProvider:
@@ -19,16 +100,42 @@ class MemoryResourceProvider:
     - memory://search?keywords={keywords} - Search memories by keywords
     """
 
-    def __init__(self, redis_adapter, postgres_adapter):
+    def __init__(
+        self,
+        redis_adapter,
+        postgres_adapter=None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         """Initialize memory resource provider.
 
         Args:
             redis_adapter: Redis cache adapter
-            postgres_adapter: PostgreSQL sync adapter
+            postgres_adapter: PostgreSQL sync adapter (optional, unused for reads)
+            http_client: Shared API client (a private one is created if omitted)
         """
         self.redis = redis_adapter
         self.postgres = postgres_adapter
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = http_client is None
+        self._client = http_client or create_api_client()
+
+        # LRU of cache key -> (monotonic expiry, payload), plus loads in progress
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        # Background cache prewarm started by list_resources
+        self._prewarm: Optional[asyncio.Task] = None
+
+    async def close(self):
+        """Stop any cache prewarm and close the API client if this provider created it."""
+        if self._prewarm:
+            self._prewarm.cancel()
+            try:
+                await self._prewarm
+            except asyncio.CancelledError:
+                pass
+            self._prewarm = None
+        if self._owns_client:
+            await self._client.aclose()
 
     async def list_resources(self) -> list[Any]:
         """List available memory resources.
@@ -38,35 +145,19 @@ class MemoryResourceProvider:
         """
         logger.info("Listing memory resources")
 
-        # List memory resources by task type
-        resources = [
-            {
-                "uri": "memory://file_creation",
-                "name": "File Creation Memories",
-                "description": "Approved patterns for file creation tasks",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "memory://bug_fix",
-                "name": "Bug Fix Memories",
-                "description": "Approved patterns for bug fixing tasks",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "memory://refactor",
-                "name": "Refactoring Memories",
-                "description": "Approved patterns for refactoring tasks",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "memory://test",
-                "name": "Testing Memories",
-                "description": "Approved patterns for testing tasks",
-                "mimeType": "application/json"
-            },
-        ]
-
-        return resources
+        # Prewarm the cache in the background so the read_resource calls that
+        # follow a listing hit it, without making the static listing wait
+        if self._prewarm is None or self._prewarm.done():
+            self._prewarm = asyncio.create_task(self._prewarm_memories())
+
+        return list(_MEMORY_RESOURCES)
+
+    async def _prewarm_memories(self):
+        """Load every listed task type into the caches, ignoring failures."""
+        try:
+            await self._get_memories_bulk(list(_MEMORY_TASK_TYPES))
+        except Exception as e:
+            logger.warning("Memory cache prewarm failed: %s", e)
 
     async def read_resource(self, uri: str) -> str:
         """Read memory resource by URI.
@@ -77,28 +168,12 @@ class MemoryResourceProvider:
         Returns:
             Resource content as JSON string
         """
-        logger.info(f"Reading memory resource: {uri}")
-
-        if not uri.startswith("memory://"):
-            raise ValueError(f"Invalid memory resource URI: {uri}")
+        logger.info("Reading memory resource: %s", uri)
 
-        # Parse URI: memory://{taskType} or memory://search?keywords={keywords}
-        path = uri[9:]  # Remove memory://
-
-        if path.startswith("search"):
-            # Search by keywords
-            keywords = ""
-            if "?" in path:
-                query_string = path.split("?", 1)[1]
-                for param in query_string.split("&"):
-                    if param.startswith("keywords="):
-                        keywords = param.split("=", 1)[1]
-
-            return await self._search_memories(keywords)
-        else:
-            # Get by task type
-            task_type = path.split("/")[0] if "/" in path else path
-            return await self._get_memories_by_type(task_type)
+        kind, arg = _parse_memory_uri(uri)
+        if kind == "search":
+            return await self._search_memories(arg)
+        return await self._get_memories_by_type(arg)
 
     async def _get_memories_by_type(self, task_type: str, limit: int = 10) -> str:
         """Get approved memories for a task type.
@@ -110,29 +185,121 @@ class MemoryResourceProvider:
         Returns:
             JSON string with memories
         """
-        # Check Redis cache first
-        cache_key = f"memory:type:{task_type}"
-        cached = await self.redis.get(cache_key)
-        if cached:
-            logger.info(f"Memory cache hit for {task_type}")
-            return cached
+        memories = await self._get_memories_bulk([task_type], limit)
+        return memories[task_type]
 
-        # Query API
-        try:
-            response = await self._client.get(
-                f"{API_URL}/approved",
-                params={"taskType": task_type, "limit": limit}
-            )
-            response.raise_for_status()
-            data = response.json()
+    async def _get_memories_bulk(
+        self, task_types: list[str], limit: int = 10
+    ) -> dict[str, str]:
+        """Get approved memories for several task types at once.
 
-            # Cache in Redis (1 hour TTL)
-            await self.redis.setex(cache_key, 3600, json.dumps(data))
+        Served from the in-process cache where possible; the rest come back
+        from a single Redis pipeline, and stale or missing entries are
+        fetched from the API concurrently and written back in one pipeline.
 
-            return json.dumps(data)
-        except Exception as e:
-            logger.error(f"Error fetching memories by type: {e}")
-            return json.dumps({"memories": [], "error": str(e)})
+        Args:
+            task_types: Types of task (file_creation, bug_fix, etc.)
+            limit: Maximum memories to return per task type
+
+        Returns:
+            Mapping of task type to JSON string with memories
+        """
+        cache_keys = [f"{MEMORY_TYPE_KEY_PREFIX}{task_type}" for task_type in task_types]
+        payloads = await self._coalesce(
+            cache_keys, lambda keys: self._load_memories_by_type(keys, limit)
+        )
+        return {task_type: payloads[key] for task_type, key in zip(task_types, cache_keys)}
+
+    async def _load_memories_by_type(self, cache_keys: list[str], limit: int) -> dict[str, str]:
+        """Load task-type memories from Redis, falling back to the API.
+
+        Entries past their freshness window are revalidated with their ETag;
+        a 304 reuses the stored body and only extends its freshness. If the
+        API can't be reached, a stale body is served as-is; the error payload
+        is only returned when nothing is stored.
+
+        Args:
+            cache_keys: memory:approved:{taskType} keys to load
+            limit: Maximum memories to return per task type
+
+        Returns:
+            Mapping of cache key to JSON string with memories
+        """
+        pipe = self.redis.pipeline()
+        for cache_key in cache_keys:
+            pipe.hmget(cache_key, "body", "etag", "fresh_until")
+        cached = await pipe.execute()
+
+        now = time.time()
+        results = {}
+        misses = []
+        stale = {}
+        etags = {}
+        for cache_key, (body, etag, fresh_until) in zip(cache_keys, cached):
+            if body and fresh_until and float(fresh_until) > now:
+                logger.info("Memory cache hit for %s", cache_key[len(MEMORY_TYPE_KEY_PREFIX):])
+                payload = body.decode()
+                self._local_set(cache_key, payload)
+                results[cache_key] = payload
+                continue
+
+            if body:
+                stale[cache_key] = body.decode()
+                if etag:
+                    etags[cache_key] = etag.decode()
+            misses.append(cache_key)
+
+        if not misses:
+            return results
+
+        # Query API for all misses concurrently, conditionally where we hold a body
+        responses = await asyncio.gather(
+            *[
+                self._client.get(
+                    f"{MEMORIES_PATH}/approved",
+                    params={"taskType": cache_key[len(MEMORY_TYPE_KEY_PREFIX):], "limit": limit},
+                    headers={"If-None-Match": etags[cache_key]} if cache_key in etags else None,
+                )
+                for cache_key in misses
+            ],
+            return_exceptions=True,
+        )
+
+        pipe = self.redis.pipeline()
+        fresh_until = now + MEMORY_TYPE_TTL
+        for cache_key, response in zip(misses, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                if response.status_code == 304 and cache_key in stale:
+                    # Unchanged: keep the stored body, just extend its freshness
+                    payload = stale[cache_key]
+                    pipe.hset(cache_key, "fresh_until", fresh_until)
+                else:
+                    response.raise_for_status()
+                    payload = response.text
+                    entry = {"body": payload, "fresh_until": fresh_until}
+                    if "etag" in response.headers:
+                        entry["etag"] = response.headers["etag"]
+                    pipe.delete(cache_key)
+                    pipe.hset(cache_key, mapping=entry)
+            except Exception as e:
+                logger.error("Error fetching memories by type: %s", e)
+                if cache_key in stale:
+                    # Serve the stale body; it is revalidated again on the next read
+                    results[cache_key] = stale[cache_key]
+                else:
+                    results[cache_key] = orjson.dumps({"memories": [], "error": str(e)}).decode()
+                continue
+
+            pipe.expire(cache_key, MEMORY_TYPE_RETAIN_TTL)
+            self._local_set(cache_key, payload)
+            results[cache_key] = payload
+
+        if len(pipe):
+            await pipe.execute()
+
+        return results
 
     async def _search_memories(self, keywords: str, limit: int = 10) -> str:
         """Search memories by keywords.
@@ -144,29 +311,135 @@ class MemoryResourceProvider:
         Returns:
             JSON string with matching memories
         """
+        cache_key = _search_cache_key(keywords)
+        payloads = await self._coalesce(
+            [cache_key], lambda keys: self._load_search(keys[0], keywords, limit)
+        )
+        return payloads[cache_key]
+
+    async def _load_search(self, cache_key: str, keywords: str, limit: int) -> dict[str, str]:
+        """Load a keyword search from Redis, falling back to the API.
+
+        Args:
+            cache_key: Search cache key
+            keywords: Comma-separated keywords
+            limit: Maximum memories to return
+
+        Returns:
+            Mapping of cache key to JSON string with matching memories
+        """
         # Check Redis cache first (short TTL for searches)
-        cache_key = f"memory:search:{hash(keywords)}"
         cached = await self.redis.get(cache_key)
         if cached:
-            logger.info(f"Memory search cache hit for {keywords}")
-            return cached
+            logger.info("Memory search cache hit for %s", keywords)
+            self._local_set(cache_key, cached)
+            return {cache_key: cached}
 
         # Query API
         try:
             response = await self._client.get(
-                f"{API_URL}/search",
+                f"{MEMORIES_PATH}/search",
                 params={"keywords": keywords, "limit": limit}
             )
             response.raise_for_status()
-            data = response.json()
+            payload = response.text
 
             # Cache in Redis (5 min TTL for searches)
-            await self.redis.setex(cache_key, 300, json.dumps(data))
+            await self.redis.setex(cache_key, MEMORY_SEARCH_TTL, payload)
+            self._local_set(cache_key, payload)
 
-            return json.dumps(data)
+            return {cache_key: payload}
         except Exception as e:
-            logger.error(f"Error searching memories: {e}")
-            return json.dumps({"memories": [], "error": str(e)})
+            logger.error("Error searching memories: %s", e)
+            return {cache_key: orjson.dumps({"memories": [], "error": str(e)}).decode()}
+
+    # In-process cache
+
+    async def _coalesce(
+        self,
+        cache_keys: list[str],
+        load: Callable[[list[str]], Awaitable[dict[str, str]]],
+    ) -> dict[str, str]:
+        """Resolve cache keys locally, sharing loads between concurrent callers.
+
+        Keys found in the in-process cache return immediately. Keys another
+        caller is already loading wait on that load. Everything else is passed
+        to load() in one call, and callers arriving meanwhile wait on it. A
+        failed load raises its error in every waiting caller; if the loading
+        caller is cancelled instead, waiters load the key themselves.
+
+        Args:
+            cache_keys: Cache keys to resolve
+            load: Loads a list of keys, returning key -> payload
+
+        Returns:
+            Mapping of cache key to payload
+        """
+        results = {}
+        waiting = {}
+        misses = []
+        for cache_key in cache_keys:
+            value = self._local_get(cache_key)
+            if value is not None:
+                results[cache_key] = value
+            elif cache_key in self._inflight:
+                waiting[cache_key] = self._inflight[cache_key]
+            elif cache_key not in misses:
+                misses.append(cache_key)
+
+        if misses:
+            loop = asyncio.get_running_loop()
+            futures = {cache_key: loop.create_future() for cache_key in misses}
+            self._inflight.update(futures)
+            try:
+                loaded = await load(misses)
+            except Exception as exc:
+                for future in futures.values():
+                    future.set_exception(exc)
+                    # Mark retrieved so a load nobody else waited on isn't reported as unhandled
+                    future.exception()
+                raise
+            except BaseException:
+                for future in futures.values():
+                    future.cancel()
+                raise
+            else:
+                for cache_key, future in futures.items():
+                    future.set_result(loaded[cache_key])
+                results.update(loaded)
+            finally:
+                for cache_key in misses:
+                    self._inflight.pop(cache_key, None)
+
+        for cache_key, future in waiting.items():
+            try:
+                results[cache_key] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The caller loading this key was cancelled, not us
+                results.update(await self._coalesce([cache_key], load))
+
+        return results
+
+    def _local_get(self, cache_key: str) -> Optional[str]:
+        """Get an unexpired payload from the in-process cache."""
+        entry = self._local.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._local[cache_key]
+            return None
+        self._local.move_to_end(cache_key)
+        return payload
+
+    def _local_set(self, cache_key: str, payload: str):
+        """Store a payload in the in-process cache, evicting the oldest entry."""
+        self._local[cache_key] = (time.monotonic() + LOCAL_CACHE_TTL, payload)
+        self._local.move_to_end(cache_key)
+        if len(self._local) > LOCAL_CACHE_SIZE:
+            self._local.popitem(last=False)
 
     async def propose_memory(
         self,
@@ -192,23 +465,30 @@ class MemoryResourceProvider:
         Returns:
             Created memory record
         """
+        payload = {
+            "taskType": task_type,
+            "pattern": pattern,
+            "solution": solution,
+            "keywords": keywords or [],
+        }
+        # Optional fields are omitted rather than sent as null
+        if error_pattern is not None:
+            payload["errorPattern"] = error_pattern
+        if proposed_by_task is not None:
+            payload["proposedByTask"] = proposed_by_task
+        if proposed_by_agent is not None:
+            payload["proposedByAgent"] = proposed_by_agent
+
         try:
             response = await self._client.post(
-                API_URL,
-                json={
-                    "taskType": task_type,
-                    "pattern": pattern,
-                    "solution": solution,
-                    "errorPattern": error_pattern,
-                    "keywords": keywords or [],
-                    "proposedByTask": proposed_by_task,
-                    "proposedByAgent": proposed_by_agent,
-                }
+                MEMORIES_PATH,
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS,
             )
             response.raise_for_status()
             return response.json()
         except Exception as e:
-            logger.error(f"Error proposing memory: {e}")
+            logger.error("Error proposing memory: %s", e)
             raise
 
     async def record_feedback(self, memory_id: str, success: bool) -> dict:
@@ -223,11 +503,11 @@ class MemoryResourceProvider:
         """
         try:
             response = await self._client.post(
-                f"{API_URL}/{memory_id}/feedback",
+                f"{MEMORIES_PATH}/{memory_id}/feedback",
                 json={"success": success}
             )
             response.raise_for_status()
             return response.json()
         except Exception as e:
-            logger.error(f"Error recording memory feedback: {e}")
+            logger.error("Error recording memory feedback: %s", e)
             raise
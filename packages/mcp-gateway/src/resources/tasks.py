@@ -1,11 +1,32 @@
 """Task resource provider for MCP."""
 
-import json
+import asyncio
+import functools
 import logging
-from typing import Any
+from typing import Any, Optional
+
+import orjson
+
+from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Task states fetched per MGET when listing resources
+LIST_BATCH_SIZE = 256
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_task_uri(uri: str) -> tuple[str, str]:
+    """Parse tasks://{taskId}/{resource_type} into (task_id, resource_type)."""
+    if not uri.startswith("tasks://"):
+        raise ValueError(f"Invalid task resource URI: {uri}")
+
+    parts = uri[8:].split("/")
+    if len(parts) < 2:
+        raise ValueError(f"Invalid task resource URI format: {uri}")
+
+    return parts[0], parts[1]
+
 
 class TaskResourceProvider:
     """Provides task-scoped resources via MCP.
@@ -15,12 +36,12 @@ class TaskResourceProvider:
     - tasks://{taskId}/files - List of files touched by task
     """
 
-    def __init__(self, redis_adapter, postgres_adapter):
+    def __init__(self, redis_adapter, postgres_adapter=None):
         """Initialize task resource provider.
 
         Args:
             redis_adapter: Redis cache adapter
-            postgres_adapter: PostgreSQL sync adapter
+            postgres_adapter: PostgreSQL sync adapter (optional, unused for reads)
         """
         self.redis = redis_adapter
         self.postgres = postgres_adapter
@@ -33,22 +54,49 @@ class TaskResourceProvider:
         """
         logger.info("Listing task resources")
 
-        resources = []
+        sem = asyncio.Semaphore(settings.worker_concurrency)
 
-        # Get all task keys from Redis
-        task_keys = await self.redis.keys("task:*")
+        async def fetch(task_ids: list[str]):
+            async with sem:
+                return task_ids, await self.redis.get_tasks(task_ids)
 
-        for task_key in task_keys:
-            # Skip keys with additional suffixes (e.g., task:123:files)
-            # We only want task state keys (task:123)
-            if task_key.count(":") > 1:
-                continue
+        # Walk task keys with SCAN, fetching each batch's state with a concurrent MGET
+        fetches = []
+        async with asyncio.TaskGroup() as tg:
+            batch = []
+            async for task_key in self.redis.scan_iter(match="task:*", count=500):
+                # Skip keys with additional suffixes (e.g., task:123:files)
+                # We only want task state keys (task:123)
+                if task_key.count(":") > 1:
+                    continue
 
-            # Extract task ID from key (task:123 -> 123)
-            task_id = task_key.split(":", 1)[1]
+                # Extract task ID from key (task:123 -> 123)
+                batch.append(task_key.split(":", 1)[1])
+                if len(batch) >= LIST_BATCH_SIZE:
+                    fetches.append(tg.create_task(fetch(batch)))
+                    batch = []
 
-            # Get task data
-            task_data = await self.redis.get_task(task_id)
+            if batch:
+                fetches.append(tg.create_task(fetch(batch)))
+
+        resources = []
+        for fetched in fetches:
+            self._add_task_resources(resources, *fetched.result())
+
+        logger.info("Listed %d task resources", len(resources))
+        return resources
+
+    def _add_task_resources(
+        self, resources: list, task_ids: list[str], task_states: list[Optional[dict]]
+    ):
+        """Append state/files descriptors for a batch of cached tasks.
+
+        Args:
+            resources: Descriptor list to extend
+            task_ids: Task IDs in the batch
+            task_states: Task data for each ID (None if not cached)
+        """
+        for task_id, task_data in zip(task_ids, task_states):
             if not task_data:
                 continue
 
@@ -68,9 +116,6 @@ class TaskResourceProvider:
                 "mimeType": "application/json"
             })
 
-        logger.info(f"Listed {len(resources)} task resources")
-        return resources
-
     async def read_resource(self, uri: str) -> str:
         """Read task resource by URI.
 
@@ -80,31 +125,34 @@ class TaskResourceProvider:
         Returns:
             Resource content as JSON string
         """
-        logger.info(f"Reading task resource: {uri}")
+        return orjson.dumps(await self.read_resource_raw(uri)).decode()
 
-        # Parse URI: tasks://{taskId}/{resource_type}
-        if not uri.startswith("tasks://"):
-            raise ValueError(f"Invalid task resource URI: {uri}")
+    async def read_resource_raw(self, uri: str) -> dict:
+        """Read task resource by URI without JSON-encoding it.
 
-        parts = uri[8:].split("/")
-        if len(parts) < 2:
-            raise ValueError(f"Invalid task resource URI format: {uri}")
+        For in-process callers; read_resource encodes this for MCP clients.
+
+        Args:
+            uri: Resource URI (e.g., tasks://task-123/state)
+
+        Returns:
+            Resource content as a dict
+        """
+        logger.info("Reading task resource: %s", uri)
 
-        task_id = parts[0]
-        resource_type = parts[1]
+        task_id, resource_type = _parse_task_uri(uri)
 
-        # TODO: Implement resource reading from Redis cache
         if resource_type == "state":
             # Get task state from Redis
             task_data = await self.redis.get_task(task_id)
             if not task_data:
                 raise ValueError(f"Task not found: {task_id}")
-            return json.dumps(task_data)
+            return task_data
 
         elif resource_type == "files":
             # Get list of files touched by this task
             files = await self.redis.get_task_files(task_id)
-            return json.dumps({"files": files})
+            return {"files": files}
 
         else:
             raise ValueError(f"Unknown resource type: {resource_type}")
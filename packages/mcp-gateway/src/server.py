@@ -5,6 +5,7 @@ import logging
 import sys
 from typing import Any
 
+import httpx
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 
@@ -12,10 +13,12 @@ from src.config import settings
 from src.resources.tasks import TaskResourceProvider
 from src.resources.files import FileResourceProvider
 from src.resources.logs import LogResourceProvider
+from src.resources.memory import MemoryResourceProvider
 from src.tools.file_ops import FileOperationTools
 from src.tools.collaboration import CollaborationTools
 from src.adapters.redis import RedisAdapter
 from src.adapters.postgres import PostgresAdapter
+from src.adapters.http import create_api_client
 
 # Configure logging
 logging.basicConfig(
@@ -35,12 +38,14 @@ class MCPGatewayServer:
         self.server = Server(settings.mcp_server_name)
         self.redis_adapter: RedisAdapter | None = None
         self.postgres_adapter: PostgresAdapter | None = None
+        self.http_client: httpx.AsyncClient | None = None
         self.sync_tasks: list[asyncio.Task] = []
 
         # Resource providers
         self.task_provider: TaskResourceProvider | None = None
         self.file_provider: FileResourceProvider | None = None
         self.log_provider: LogResourceProvider | None = None
+        self.memory_provider: MemoryResourceProvider | None = None
 
         # Tool providers
         self.file_tools: FileOperationTools | None = None
@@ -50,19 +55,23 @@ class MCPGatewayServer:
         """Initialize adapters and providers."""
         logger.info("Initializing MCP Gateway server...")
 
-        # Initialize adapters
+        # Initialize adapters (connected concurrently; Postgres only feeds the sync tasks)
         self.redis_adapter = RedisAdapter()
-        await self.redis_adapter.connect()
-        logger.info("Redis adapter connected")
-
         self.postgres_adapter = PostgresAdapter(self.redis_adapter)
-        await self.postgres_adapter.connect()
-        logger.info("PostgreSQL adapter connected")
+        await asyncio.gather(self.redis_adapter.connect(), self.postgres_adapter.connect())
+        logger.info("Redis and PostgreSQL adapters connected")
+
+        # One pooled API client shared by every provider that calls the backend
+        self.http_client = create_api_client()
 
         # Initialize resource providers
-        self.task_provider = TaskResourceProvider(self.redis_adapter, self.postgres_adapter)
+        self.task_provider = TaskResourceProvider(self.redis_adapter)
         self.file_provider = FileResourceProvider(self.redis_adapter)
         self.log_provider = LogResourceProvider(self.redis_adapter)
+        self.log_provider.start()
+        self.memory_provider = MemoryResourceProvider(
+            self.redis_adapter, http_client=self.http_client
+        )
 
         # Initialize tool providers
         self.file_tools = FileOperationTools(self.redis_adapter, self.file_provider)
@@ -89,26 +98,21 @@ class MCPGatewayServer:
             """List available task resources."""
             return await self.task_provider.list_resources()
 
-        @self.server.read_resource()
-        async def read_task_resource(uri: str) -> str:
-            """Read task resource by URI."""
-            return await self.task_provider.read_resource(uri)
-
-        # File resources
-        @self.server.read_resource()
-        async def read_file_resource(uri: str) -> str:
-            """Read file resource by URI."""
-            if uri.startswith("workspace://"):
-                return await self.file_provider.read_resource(uri)
-            raise ValueError(f"Unknown resource URI: {uri}")
+        # Single read handler dispatching on URI scheme
+        readers = {
+            "tasks": self.task_provider.read_resource,
+            "workspace": self.file_provider.read_resource,
+            "logs": self.log_provider.read_resource,
+            "memory": self.memory_provider.read_resource,
+        }
 
-        # Log resources (streaming)
         @self.server.read_resource()
-        async def read_log_resource(uri: str) -> str:
-            """Read log resource by URI."""
-            if uri.startswith("logs://"):
-                return await self.log_provider.read_resource(uri)
-            raise ValueError(f"Unknown resource URI: {uri}")
+        async def read_resource(uri: str) -> str:
+            """Read task, file, log, or memory resource by URI."""
+            reader = readers.get(uri.split("://", 1)[0])
+            if reader is None:
+                raise ValueError(f"Unknown resource URI: {uri}")
+            return await reader(uri)
 
         logger.info("MCP resources registered")
 
@@ -132,6 +136,11 @@ class MCPGatewayServer:
             """Claim file lock."""
             return await self.file_tools.claim_file(task_id, path)
 
+        @self.server.call_tool()
+        async def mcp_claim_files(task_id: str, paths: list[str]) -> dict:
+            """Claim several file locks at once."""
+            return await self.file_tools.claim_files(task_id, paths)
+
         @self.server.call_tool()
         async def mcp_release_file(task_id: str, path: str) -> dict:
             """Release file lock."""
@@ -176,7 +185,17 @@ class MCPGatewayServer:
             except asyncio.CancelledError:
                 pass
 
+        # Flush queued log steps before Redis goes away
+        if self.log_provider:
+            await self.log_provider.close()
+
+        # Stop the memory cache prewarm before its client goes away
+        if self.memory_provider:
+            await self.memory_provider.close()
+
         # Close adapters
+        if self.http_client:
+            await self.http_client.aclose()
         if self.postgres_adapter:
             await self.postgres_adapter.close()
         if self.redis_adapter:
@@ -240,4 +259,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Prefer uvloop's libuv event loop when installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
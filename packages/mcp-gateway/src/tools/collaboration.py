@@ -1,8 +1,11 @@
 """Collaboration tools for MCP."""
 
-import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+
+import orjson
+
+from src.adapters.redis import log_channel, log_stream_key
 
 logger = logging.getLogger(__name__)
 
@@ -35,12 +38,12 @@ class CollaborationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Logging execution step: {step.get('action', 'unknown')}")
+        logger.info("[%s] Logging execution step: %s", task_id, step.get('action', 'unknown'))
 
         try:
             # Add timestamp if not present
             if "timestamp" not in step:
-                step["timestamp"] = datetime.utcnow().isoformat()
+                step["timestamp"] = datetime.now(timezone.utc).isoformat()
 
             # Add task_id if not present
             if "task_id" not in step:
@@ -57,7 +60,7 @@ class CollaborationTools:
             }
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error logging step: {e}")
+            logger.error("[%s] Error logging step: %s", task_id, e)
             return {"success": False, "error": str(e)}
 
     async def subscribe_logs(self, task_id: str) -> dict:
@@ -69,22 +72,25 @@ class CollaborationTools:
         Returns:
             Subscription info
         """
-        logger.info(f"[{task_id}] Subscribing to log stream")
+        logger.info("[%s] Subscribing to log stream", task_id)
 
         try:
-            # Get subscription channel info
-            channel = f"logs:{task_id}:stream"
+            # Steps go to a Redis Stream (XREAD) and are also published on the
+            # pub/sub channel existing clients subscribe to
+            channel = log_channel(task_id)
+            stream_key = log_stream_key(task_id)
 
             # Return subscription details (actual subscription handled by client)
             return {
                 "success": True,
                 "task_id": task_id,
                 "channel": channel,
+                "stream_key": stream_key,
                 "message": f"Subscribe to Redis channel '{channel}' for real-time logs",
             }
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error subscribing to logs: {e}")
+            logger.error("[%s] Error subscribing to logs: %s", task_id, e)
             return {"success": False, "error": str(e)}
 
     async def get_collaborating_agents(self, task_id: str) -> dict:
@@ -96,7 +102,7 @@ class CollaborationTools:
         Returns:
             List of agent IDs
         """
-        logger.info(f"[{task_id}] Getting collaborating agents")
+        logger.info("[%s] Getting collaborating agents", task_id)
 
         try:
             # Get active agents from Redis
@@ -110,7 +116,7 @@ class CollaborationTools:
             }
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error getting collaborating agents: {e}")
+            logger.error("[%s] Error getting collaborating agents: %s", task_id, e)
             return {"success": False, "error": str(e)}
 
     async def join_collaboration(self, task_id: str, agent_id: str) -> dict:
@@ -123,30 +129,31 @@ class CollaborationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Agent {agent_id} joining collaboration")
+        logger.info("[%s] Agent %s joining collaboration", task_id, agent_id)
 
         try:
-            # Add agent to collaboration set
             collab_key = f"collaboration:{task_id}"
-            await self.redis.sadd(collab_key, agent_id)
-            await self.redis.expire(collab_key, 3600)  # 1 hour TTL
-
-            # Broadcast join event
-            await self.redis.publish(
-                f"collaboration:{task_id}:events",
-                json.dumps({
-                    "event": "agent_joined",
-                    "agent_id": agent_id,
-                    "task_id": task_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }),
-            )
-
-            logger.info(f"[{task_id}] Agent {agent_id} joined collaboration")
+            payload = orjson.dumps({
+                "event": "agent_joined",
+                "agent_id": agent_id,
+                "task_id": task_id,
+                "timestamp": datetime.now(timezone.utc),  # formatted by orjson
+            })
+
+            # Add agent to collaboration set in one round-trip
+            pipe = self.redis.pipeline()
+            pipe.sadd(collab_key, agent_id)
+            pipe.expire(collab_key, 3600)  # 1 hour TTL
+            await pipe.execute()
+
+            # Broadcast join event (coalesced with other queued events by the publisher)
+            await self.redis.publish_nowait(f"collaboration:{task_id}:events", payload)
+
+            logger.info("[%s] Agent %s joined collaboration", task_id, agent_id)
             return {"success": True, "task_id": task_id, "agent_id": agent_id}
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error joining collaboration: {e}")
+            logger.error("[%s] Error joining collaboration: %s", task_id, e)
             return {"success": False, "error": str(e)}
 
     async def leave_collaboration(self, task_id: str, agent_id: str) -> dict:
@@ -159,27 +166,26 @@ class CollaborationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Agent {agent_id} leaving collaboration")
+        logger.info("[%s] Agent %s leaving collaboration", task_id, agent_id)
 
         try:
-            # Remove agent from collaboration set
             collab_key = f"collaboration:{task_id}"
+            payload = orjson.dumps({
+                "event": "agent_left",
+                "agent_id": agent_id,
+                "task_id": task_id,
+                "timestamp": datetime.now(timezone.utc),  # formatted by orjson
+            })
+
+            # Remove agent from collaboration set
             await self.redis.srem(collab_key, agent_id)
 
-            # Broadcast leave event
-            await self.redis.publish(
-                f"collaboration:{task_id}:events",
-                json.dumps({
-                    "event": "agent_left",
-                    "agent_id": agent_id,
-                    "task_id": task_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }),
-            )
-
-            logger.info(f"[{task_id}] Agent {agent_id} left collaboration")
+            # Broadcast leave event (coalesced with other queued events by the publisher)
+            await self.redis.publish_nowait(f"collaboration:{task_id}:events", payload)
+
+            logger.info("[%s] Agent %s left collaboration", task_id, agent_id)
             return {"success": True, "task_id": task_id, "agent_id": agent_id}
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error leaving collaboration: {e}")
+            logger.error("[%s] Error leaving collaboration: %s", task_id, e)
             return {"success": False, "error": str(e)}
@@ -1,10 +1,68 @@
 """File operation tools for MCP."""
 
-import json
+import functools
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Take the lock if it is free and broadcast the claim, or report the
+# current owner: {1, ''} on success, {0, owner} on conflict
+CLAIM_LOCK_SCRIPT = """
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    redis.call('publish', KEYS[2], ARGV[3])
+    return {1, ''}
+end
+return {0, redis.call('get', KEYS[1]) or ''}
+"""
+
+# Delete the lock only if the caller still owns it (compare-and-delete),
+# broadcasting the release in the same step
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('publish', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Bulk claim over KEYS[1..n] lock keys and KEYS[n+1..2n] event channels.
+# ARGV: task_id, ttl, all-or-nothing flag, then one event payload per path.
+# Returns {acquired indices, {index, owner} conflicts}. In all-or-nothing
+# mode every lock is checked before any is taken, so nothing needs rolling back.
+CLAIM_LOCKS_SCRIPT = """
+local n = #KEYS / 2
+local acquired, conflicts = {}, {}
+if ARGV[3] == '1' then
+    for i = 1, n do
+        local owner = redis.call('get', KEYS[i])
+        if owner then
+            table.insert(conflicts, {i, owner})
+        end
+    end
+    if #conflicts > 0 then
+        return {acquired, conflicts}
+    end
+end
+for i = 1, n do
+    if redis.call('set', KEYS[i], ARGV[1], 'NX', 'EX', ARGV[2]) then
+        redis.call('publish', KEYS[n + i], ARGV[3 + i])
+        table.insert(acquired, i)
+    else
+        table.insert(conflicts, {i, redis.call('get', KEYS[i]) or ''})
+    end
+end
+return {acquired, conflicts}
+"""
+
+
+@functools.lru_cache(maxsize=2048)
+def _lock_keys(path: str) -> tuple[str, str]:
+    """Return the lock key and lock event channel for a file path."""
+    return f"lock:file:{path}", f"locks:{path}"
+
 
 class FileLockError(Exception):
     """Raised when file lock cannot be acquired."""
@@ -19,6 +77,7 @@ class FileOperationTools:
     - mcp_file_read(task_id, path) - Read file with task scoping
     - mcp_file_write(task_id, path, content) - Write with conflict detection
     - mcp_claim_file(task_id, path) - Acquire file lock (60s timeout)
+    - mcp_claim_files(task_id, paths) - Acquire several file locks in one round-trip
     - mcp_release_file(task_id, path) - Release file lock
     """
 
@@ -31,6 +90,9 @@ class FileOperationTools:
         """
         self.redis = redis_adapter
         self.file_provider = file_provider
+        self._claim_sha = redis_adapter.register_script(CLAIM_LOCK_SCRIPT)
+        self._claim_many_sha = redis_adapter.register_script(CLAIM_LOCKS_SCRIPT)
+        self._release_sha = redis_adapter.register_script(RELEASE_LOCK_SCRIPT)
 
     async def file_read(self, task_id: str, path: str) -> dict:
         """Read file via MCP.
@@ -42,7 +104,7 @@ class FileOperationTools:
         Returns:
             File content
         """
-        logger.info(f"[{task_id}] Reading file: {path}")
+        logger.info("[%s] Reading file: %s", task_id, path)
 
         try:
             # Construct resource URI
@@ -59,7 +121,7 @@ class FileOperationTools:
             }
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error reading file {path}: {e}")
+            logger.error("[%s] Error reading file %s: %s", task_id, path, e)
             return {"success": False, "error": str(e)}
 
     async def file_write(self, task_id: str, path: str, content: str) -> dict:
@@ -73,7 +135,7 @@ class FileOperationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Writing file: {path}")
+        logger.info("[%s] Writing file: %s", task_id, path)
 
         try:
             # Check if file is locked by another task
@@ -84,16 +146,16 @@ class FileOperationTools:
             # Write file
             result = await self.file_provider.write_file(task_id, path, content)
 
-            # Broadcast file update event
-            await self.redis.publish(
-                f"file:updates",
-                json.dumps({"task_id": task_id, "path": path, "action": "write"}),
+            # Broadcast file update event once the write has landed (fire-and-forget)
+            await self.redis.publish_nowait(
+                "file:updates",
+                orjson.dumps({"task_id": task_id, "path": path, "action": "write"}),
             )
 
             return {"success": True, "task_id": task_id, **result}
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error writing file {path}: {e}")
+            logger.error("[%s] Error writing file %s: %s", task_id, path, e)
             return {"success": False, "error": str(e)}
 
     async def claim_file(self, task_id: str, path: str, timeout_sec: int = 60) -> dict:
@@ -107,36 +169,88 @@ class FileOperationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Claiming file lock: {path}")
+        logger.info("[%s] Claiming file lock: %s", task_id, path)
 
         try:
-            lock_key = f"lock:file:{path}"
+            lock_key, channel = _lock_keys(path)
+
+            payload = orjson.dumps({"locked": True, "by": task_id, "path": path})
 
-            # Try to acquire lock using Redis SETNX (atomic)
-            acquired = await self.redis.set(
-                lock_key, task_id, nx=True, ex=timeout_sec  # Only set if not exists
+            # Acquire the lock (SET NX EX) and broadcast it, or get the current
+            # owner for the error message, in one atomic round-trip
+            acquired, owner = await self.redis.eval_sha(
+                self._claim_sha, [lock_key, channel], [task_id, timeout_sec, payload]
             )
 
             if not acquired:
                 # Lock already held
-                owner = await self.redis.get(lock_key)
-                raise FileLockError(f"File locked by task {owner}")
+                raise FileLockError(f"File locked by task {owner.decode()}")
 
-            # Broadcast lock acquisition
-            await self.redis.publish(
-                f"locks:{path}",
-                json.dumps({"locked": True, "by": task_id, "path": path}),
-            )
-
-            logger.info(f"[{task_id}] File lock acquired: {path}")
+            logger.info("[%s] File lock acquired: %s", task_id, path)
             return {"success": True, "task_id": task_id, "path": path, "locked": True}
 
         except FileLockError as e:
-            logger.warning(f"[{task_id}] Failed to acquire lock for {path}: {e}")
+            logger.warning("[%s] Failed to acquire lock for %s: %s", task_id, path, e)
             return {"success": False, "error": str(e), "locked": False}
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error acquiring lock for {path}: {e}")
+            logger.error("[%s] Error acquiring lock for %s: %s", task_id, path, e)
+            return {"success": False, "error": str(e)}
+
+    async def claim_files(
+        self,
+        task_id: str,
+        paths: list[str],
+        timeout_sec: int = 60,
+        all_or_nothing: bool = False,
+    ) -> dict:
+        """Acquire several file locks in one atomic round-trip.
+
+        Args:
+            task_id: Task ID
+            paths: File paths
+            timeout_sec: Lock timeout in seconds (default: 60)
+            all_or_nothing: Take no locks unless every path is free
+
+        Returns:
+            Result dictionary with acquired paths and conflicts (path -> owner)
+        """
+        paths = list(dict.fromkeys(paths))
+        logger.info("[%s] Claiming %d file locks", task_id, len(paths))
+
+        if not paths:
+            return {"success": True, "task_id": task_id, "acquired": [], "conflicts": {}}
+
+        try:
+            lock_keys, channels = zip(*map(_lock_keys, paths))
+            payloads = [
+                orjson.dumps({"locked": True, "by": task_id, "path": path}) for path in paths
+            ]
+
+            acquired_idx, conflict_pairs = await self.redis.eval_sha(
+                self._claim_many_sha,
+                [*lock_keys, *channels],
+                [task_id, timeout_sec, int(all_or_nothing), *payloads],
+            )
+
+            # Lua indices are 1-based
+            acquired = [paths[i - 1] for i in acquired_idx]
+            conflicts = {paths[i - 1]: owner.decode() for i, owner in conflict_pairs}
+
+            if conflicts:
+                logger.warning(
+                    "[%s] %d of %d file locks held by other tasks",
+                    task_id, len(conflicts), len(paths),
+                )
+            return {
+                "success": not conflicts,
+                "task_id": task_id,
+                "acquired": acquired,
+                "conflicts": conflicts,
+            }
+
+        except Exception as e:
+            logger.error("[%s] Error acquiring %d file locks: %s", task_id, len(paths), e)
             return {"success": False, "error": str(e)}
 
     async def release_file(self, task_id: str, path: str) -> dict:
@@ -149,30 +263,26 @@ class FileOperationTools:
         Returns:
             Result dictionary
         """
-        logger.info(f"[{task_id}] Releasing file lock: {path}")
+        logger.info("[%s] Releasing file lock: %s", task_id, path)
 
         try:
-            lock_key = f"lock:file:{path}"
+            lock_key, channel = _lock_keys(path)
 
-            # Verify this task owns the lock
-            owner = await self.redis.get(lock_key)
-            if owner != task_id:
+            payload = orjson.dumps({"locked": False, "by": task_id, "path": path})
+
+            # Release lock only if this task owns it, broadcasting the release (one round-trip)
+            released = await self.redis.eval_sha(
+                self._release_sha, [lock_key, channel], [task_id, payload]
+            )
+            if not released:
+                owner = await self.redis.get(lock_key)
                 raise FileLockError(
                     f"Cannot release lock owned by task {owner}" if owner else "Lock not held"
                 )
 
-            # Release lock
-            await self.redis.delete(lock_key)
-
-            # Broadcast lock release
-            await self.redis.publish(
-                f"locks:{path}",
-                json.dumps({"locked": False, "by": task_id, "path": path}),
-            )
-
-            logger.info(f"[{task_id}] File lock released: {path}")
+            logger.info("[%s] File lock released: %s", task_id, path)
             return {"success": True, "task_id": task_id, "path": path, "locked": False}
 
         except Exception as e:
-            logger.error(f"[{task_id}] Error releasing lock for {path}: {e}")
+            logger.error("[%s] Error releasing lock for %s: %s", task_id, path, e)
             return {"success": False, "error": str(e)}
@@ -9,7 +9,6 @@ This test suite verifies that all MCP resources and tools work correctly:
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
@@ -69,13 +68,17 @@ class MCPIntegrationTest:
         """Cleanup test resources."""
         print("\n🧹 Cleaning up test resources...")
 
-        # Delete test task from Redis
-        await self.redis.delete(f"task:{self.test_task_id}")
-        await self.redis.delete(f"task_files:{self.test_task_id}")
-        await self.redis.delete(f"logs:{self.test_task_id}")
-        await self.redis.delete(f"collaboration:{self.test_task_id}")
+        # Delete test task keys from Redis (one round-trip)
+        await self.redis.unlink(
+            f"task:{self.test_task_id}",
+            f"task:{self.test_task_id}:files",
+            f"logstream:{self.test_task_id}",
+            f"collaboration:{self.test_task_id}",
+        )
 
         # Close connections
+        if self.log_provider:
+            await self.log_provider.close()
         if self.postgres:
             await self.postgres.close()
         if self.redis:
@@ -133,8 +136,7 @@ class MCPIntegrationTest:
         print("\n🔍 Test 3: Read task state resource")
 
         uri = f"tasks://{self.test_task_id}/state"
-        content = await self.task_provider.read_resource(uri)
-        data = json.loads(content)
+        data = await self.task_provider.read_resource_raw(uri)
 
         if data["id"] == self.test_task_id and data["title"] == "Test Task":
             self.log_result("Task state read", True, f"Read task state: {data['title']}")
@@ -211,7 +213,8 @@ class MCPIntegrationTest:
             self.log_result("Log step", False, f"Log failed: {log_result.get('error')}")
             return
 
-        # Read logs
+        # Read logs (flush the batched writer first)
+        await self.log_provider.flush()
         logs = await self.redis.get_logs(self.test_task_id, limit=10)
 
         if logs and any(log.get("action") == "file_write" for log in logs):
@@ -259,14 +262,26 @@ class MCPIntegrationTest:
         try:
             await self.setup()
 
-            # Run tests
+            # Test 1 creates the task fixture the others read
             await self.test_task_state_cache()
-            await self.test_task_resource_listing()
-            await self.test_task_state_read()
-            await self.test_file_write_and_read()
+
+            # Tests 2-4, 6 and 7 are independent, so overlap their Redis round-trips
+            concurrent_tests = [
+                self.test_task_resource_listing,
+                self.test_task_state_read,
+                self.test_file_write_and_read,
+                self.test_log_streaming,
+                self.test_collaboration_join,
+            ]
+            outcomes = await asyncio.gather(
+                *(test() for test in concurrent_tests), return_exceptions=True
+            )
+            for test, outcome in zip(concurrent_tests, outcomes):
+                if isinstance(outcome, Exception):
+                    self.log_result(test.__doc__, False, f"Error: {outcome}")
+
+            # Lock test mutates a shared lock key; run it on its own
             await self.test_file_locks()
-            await self.test_log_streaming()
-            await self.test_collaboration_join()
 
         except Exception as e:
             print(f"\n❌ Test suite error: {e}")
@@ -0,0 +1,15 @@
+"""Shared fixtures for MCP Gateway tests."""
+
+import fakeredis
+import pytest
+
+from src.adapters.redis import RedisAdapter
+
+
+@pytest.fixture
+async def redis_adapter():
+    """RedisAdapter backed by an in-process fakeredis server (with Lua support)."""
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    yield adapter
+    await adapter.close()
@@ -0,0 +1,90 @@
+"""Tests for request parsing and response encoding in src.api."""
+
+import httpx
+import pytest
+
+from src import api
+from src.resources.logs import LogResourceProvider
+from src.tools.collaboration import CollaborationTools
+
+
+@pytest.fixture
+async def client(redis_adapter, monkeypatch):
+    log_provider = LogResourceProvider(redis_adapter)
+    monkeypatch.setattr(api, "redis_adapter", redis_adapter)
+    monkeypatch.setattr(api, "collab_tools", CollaborationTools(redis_adapter, log_provider))
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    await log_provider.close()
+
+
+async def test_valid_body(client):
+    response = await client.post(
+        "/tools/log_step", json={"task_id": "t1", "step": {"action": "file_write"}}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert body["success"] is True
+    assert body["step"]["action"] == "file_write"
+
+
+async def test_missing_field(client):
+    response = await client.post("/tools/log_step", json={"step": {}})
+
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "task_id"]
+    assert error["type"] == "missing"
+
+
+async def test_wrong_type(client):
+    response = await client.post("/tools/log_step", json={"task_id": "t1", "step": "not a dict"})
+
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "step"]
+
+
+async def test_invalid_json(client):
+    response = await client.post(
+        "/tools/log_step",
+        content=b'{"task_id": ',
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "json_invalid"
+    # FastAPI's own shape: the position of the decode error within the body
+    assert error["loc"] == ["body", 12]
+
+
+async def test_task_state(client, redis_adapter):
+    await redis_adapter.set_task("t1", {"id": "t1", "status": "running", "files": ["a.py"]})
+
+    response = await client.get("/resources/tasks/t1/state")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": "t1", "status": "running", "files": ["a.py"]}
+
+
+def test_openapi_documents_request_bodies():
+    schema = api.app.openapi()
+
+    for path, model in [
+        ("/tools/file_read", "FileReadRequest"),
+        ("/tools/file_write", "FileWriteRequest"),
+        ("/tools/claim_files", "ClaimFilesRequest"),
+        ("/tools/log_step", "LogStepRequest"),
+        ("/tools/join_collaboration", "CollaborationRequest"),
+    ]:
+        body = schema["paths"][path]["post"]["requestBody"]
+        assert body["required"] is True
+        assert body["content"]["application/json"]["schema"]["$ref"] == (
+            f"#/components/schemas/{model}"
+        )
+        assert model in schema["components"]["schemas"]
@@ -0,0 +1,181 @@
+"""Tests for the Lua file-lock scripts in src.tools.file_ops."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from src.tools.file_ops import FileOperationTools
+
+
+class StubFileProvider:
+    """File provider that records writes instead of touching the workspace."""
+
+    def __init__(self):
+        self.writes = []
+
+    async def write_file(self, task_id: str, path: str, content: str) -> dict:
+        self.writes.append((task_id, path, content))
+        return {"path": path, "size": len(content)}
+
+
+@pytest.fixture
+def file_provider():
+    return StubFileProvider()
+
+
+@pytest.fixture
+def tools(redis_adapter, file_provider):
+    return FileOperationTools(redis_adapter, file_provider)
+
+
+async def next_message(pubsub) -> dict:
+    """Wait for the next published message on a subscription."""
+    async with asyncio.timeout(1):
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+            if message is not None:
+                return message
+
+
+async def test_claim_file_takes_lock_and_broadcasts(tools, redis_adapter):
+    pubsub = redis_adapter.client.pubsub()
+    await pubsub.subscribe("locks:src/app.py")
+
+    result = await tools.claim_file("task-1", "src/app.py", timeout_sec=30)
+
+    assert result == {"success": True, "task_id": "task-1", "path": "src/app.py", "locked": True}
+    assert await redis_adapter.get_lock_owner("src/app.py") == "task-1"
+    assert 0 < await redis_adapter.client.ttl("lock:file:src/app.py") <= 30
+    message = await next_message(pubsub)
+    assert orjson.loads(message["data"]) == {"locked": True, "by": "task-1", "path": "src/app.py"}
+    await pubsub.aclose()
+
+
+async def test_claim_file_conflict_reports_owner(tools, redis_adapter):
+    await tools.claim_file("task-1", "src/app.py")
+
+    result = await tools.claim_file("task-2", "src/app.py")
+
+    assert result == {
+        "success": False,
+        "error": "File locked by task task-1",
+        "locked": False,
+    }
+    assert await redis_adapter.get_lock_owner("src/app.py") == "task-1"
+
+
+async def test_claim_file_falls_back_to_eval_on_noscript(tools, redis_adapter):
+    await tools.claim_file("task-1", "a.py")
+    await redis_adapter.client.script_flush()
+    assert await redis_adapter.client.script_exists(tools._claim_sha) == [False]
+
+    result = await tools.claim_file("task-1", "b.py")
+
+    assert result["success"] is True
+    assert await redis_adapter.get_lock_owner("b.py") == "task-1"
+
+
+async def test_release_file_by_owner(tools, redis_adapter):
+    await tools.claim_file("task-1", "src/app.py")
+    pubsub = redis_adapter.client.pubsub()
+    await pubsub.subscribe("locks:src/app.py")
+
+    result = await tools.release_file("task-1", "src/app.py")
+
+    assert result == {"success": True, "task_id": "task-1", "path": "src/app.py", "locked": False}
+    assert await redis_adapter.get_lock_owner("src/app.py") is None
+    message = await next_message(pubsub)
+    assert orjson.loads(message["data"]) == {"locked": False, "by": "task-1", "path": "src/app.py"}
+    await pubsub.aclose()
+
+
+async def test_release_file_by_other_task_keeps_lock(tools, redis_adapter):
+    await tools.claim_file("task-1", "src/app.py")
+
+    result = await tools.release_file("task-2", "src/app.py")
+
+    assert result == {"success": False, "error": "Cannot release lock owned by task task-1"}
+    assert await redis_adapter.get_lock_owner("src/app.py") == "task-1"
+
+
+async def test_release_file_without_lock(tools):
+    result = await tools.release_file("task-1", "src/app.py")
+
+    assert result == {"success": False, "error": "Lock not held"}
+
+
+async def test_file_write_blocked_by_other_owner(tools, file_provider):
+    await tools.claim_file("task-1", "src/app.py")
+
+    blocked = await tools.file_write("task-2", "src/app.py", "x = 1\n")
+    allowed = await tools.file_write("task-1", "src/app.py", "x = 2\n")
+
+    assert blocked == {"success": False, "error": "File locked by task task-1"}
+    assert allowed["success"] is True
+    assert file_provider.writes == [("task-1", "src/app.py", "x = 2\n")]
+
+
+async def test_file_write_sees_release_by_another_process(tools, redis_adapter, file_provider):
+    # A second FileOperationTools stands in for another gateway process
+    other = FileOperationTools(redis_adapter, file_provider)
+    await tools.claim_file("task-1", "src/app.py")
+    await tools.release_file("task-1", "src/app.py")
+    await other.claim_file("task-2", "src/app.py")
+
+    result = await tools.file_write("task-1", "src/app.py", "x = 1\n")
+
+    assert result == {"success": False, "error": "File locked by task task-2"}
+    assert file_provider.writes == []
+
+
+async def test_claim_files_all_or_nothing_takes_nothing_on_conflict(tools, redis_adapter):
+    await tools.claim_file("task-1", "b.py")
+
+    result = await tools.claim_files("task-2", ["a.py", "b.py", "c.py"], all_or_nothing=True)
+
+    assert result == {
+        "success": False,
+        "task_id": "task-2",
+        "acquired": [],
+        "conflicts": {"b.py": "task-1"},
+    }
+    assert await redis_adapter.get_lock_owner("a.py") is None
+    assert await redis_adapter.get_lock_owner("c.py") is None
+
+
+async def test_claim_files_all_or_nothing_takes_every_free_lock(tools, redis_adapter):
+    result = await tools.claim_files("task-1", ["a.py", "b.py"], all_or_nothing=True)
+
+    assert result["success"] is True
+    assert result["acquired"] == ["a.py", "b.py"]
+    assert await redis_adapter.get_lock_owner("a.py") == "task-1"
+    assert await redis_adapter.get_lock_owner("b.py") == "task-1"
+
+
+async def test_claim_files_partial_takes_free_locks(tools, redis_adapter):
+    await tools.claim_file("task-1", "b.py")
+    pubsub = redis_adapter.client.pubsub()
+    await pubsub.subscribe("locks:a.py", "locks:b.py", "locks:c.py")
+
+    result = await tools.claim_files("task-2", ["a.py", "b.py", "c.py", "a.py"])
+
+    assert result == {
+        "success": False,
+        "task_id": "task-2",
+        "acquired": ["a.py", "c.py"],
+        "conflicts": {"b.py": "task-1"},
+    }
+    assert await redis_adapter.get_lock_owner("a.py") == "task-2"
+    assert await redis_adapter.get_lock_owner("b.py") == "task-1"
+    assert await redis_adapter.get_lock_owner("c.py") == "task-2"
+    # Only the locks actually taken are broadcast
+    channels = [(await next_message(pubsub))["channel"] for _ in range(2)]
+    assert channels == [b"locks:a.py", b"locks:c.py"]
+    await pubsub.aclose()
+
+
+async def test_claim_files_empty(tools):
+    result = await tools.claim_files("task-1", [])
+
+    assert result == {"success": True, "task_id": "task-1", "acquired": [], "conflicts": {}}
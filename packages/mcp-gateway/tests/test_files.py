@@ -0,0 +1,165 @@
+"""Tests for task-scoped workspace file access in src.resources.files."""
+
+import os
+import shutil
+
+import pytest
+
+from src.resources.files import FileResourceProvider, _split_relative
+
+TASK_ID = "task-1"
+
+
+@pytest.fixture
+async def provider(redis_adapter, tmp_path):
+    await redis_adapter.set_task(TASK_ID, {"id": TASK_ID})
+    provider = FileResourceProvider(redis_adapter)
+    provider._tasks_dir = str(tmp_path / "tasks")
+    return provider
+
+
+@pytest.fixture
+def tasks_dir(provider):
+    provider._root_fd()
+    return provider._tasks_dir
+
+
+def _uri(path: str) -> str:
+    return f"workspace://{TASK_ID}/{path}"
+
+
+async def _read_stream(provider, path: str) -> bytes:
+    return b"".join([chunk async for chunk in await provider.open_stream(TASK_ID, path)])
+
+
+@pytest.mark.parametrize(
+    "path, parts",
+    [
+        ("a.py", ["a.py"]),
+        ("src/a.py", ["src", "a.py"]),
+        ("./src//a.py", ["src", "a.py"]),
+    ],
+)
+def test_split_relative(path, parts):
+    assert _split_relative(path) == parts
+
+
+@pytest.mark.parametrize("path", ["", "/", ".", "./", "/etc/passwd", "..", "../x", "a/../../x"])
+def test_split_relative_rejects(path):
+    with pytest.raises(ValueError):
+        _split_relative(path)
+
+
+async def test_write_then_read(provider, redis_adapter):
+    result = await provider.write_file(TASK_ID, "src/calc.py", "print(1)\n")
+
+    assert result == {"success": True, "path": "src/calc.py", "bytes": 9}
+    assert await provider.read_resource(_uri("src/calc.py")) == "print(1)\n"
+    assert await _read_stream(provider, "src/calc.py") == b"print(1)\n"
+    assert await redis_adapter.get_task_files(TASK_ID) == ["src/calc.py"]
+
+
+async def test_stream_is_chunked(provider, tasks_dir):
+    with open(os.path.join(tasks_dir, "big.bin"), "wb") as f:
+        f.write(b"x" * 10)
+
+    chunks = [chunk async for chunk in await provider.open_stream(TASK_ID, "big.bin", 4)]
+
+    assert chunks == [b"xxxx", b"xxxx", b"xx"]
+
+
+@pytest.mark.parametrize("path", ["../outside.txt", "/etc/passwd", "", "a/../../outside.txt"])
+async def test_traversal_rejected(provider, tasks_dir, path):
+    with pytest.raises(ValueError):
+        await provider.read_resource(_uri(path))
+    with pytest.raises(ValueError):
+        await provider.open_stream(TASK_ID, path)
+    with pytest.raises(ValueError):
+        await provider.write_file(TASK_ID, path, "x")
+    assert not os.path.exists(os.path.join(os.path.dirname(tasks_dir), "outside.txt"))
+
+
+async def test_missing_file(provider, tasks_dir):
+    with pytest.raises(FileNotFoundError):
+        await provider.read_resource(_uri("missing.py"))
+    with pytest.raises(FileNotFoundError):
+        await provider.open_stream(TASK_ID, "missing.py")
+    with pytest.raises(FileNotFoundError):
+        await provider.open_stream(TASK_ID, "missing/dir/file.py")
+
+
+async def test_directory_target(provider, tasks_dir):
+    os.mkdir(os.path.join(tasks_dir, "src"))
+
+    with pytest.raises(FileNotFoundError):
+        await provider.read_resource(_uri("src"))
+    with pytest.raises(FileNotFoundError):
+        await provider.open_stream(TASK_ID, "src")
+
+
+async def test_file_used_as_directory(provider, tasks_dir):
+    with open(os.path.join(tasks_dir, "a.py"), "w") as f:
+        f.write("x")
+
+    with pytest.raises(FileNotFoundError):
+        await provider.read_resource(_uri("a.py/b.py"))
+
+
+async def test_symlinked_final_file(provider, tasks_dir, tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    os.symlink(secret, os.path.join(tasks_dir, "link.txt"))
+
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.read_resource(_uri("link.txt"))
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.open_stream(TASK_ID, "link.txt")
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.write_file(TASK_ID, "link.txt", "overwritten")
+    assert secret.read_text() == "secret"
+
+
+async def test_symlinked_directory_component(provider, tasks_dir, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("secret")
+    os.symlink(outside, os.path.join(tasks_dir, "linkdir"))
+
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.read_resource(_uri("linkdir/secret.txt"))
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.open_stream(TASK_ID, "linkdir/secret.txt")
+    with pytest.raises(ValueError, match="Symlinks"):
+        await provider.write_file(TASK_ID, "linkdir/new.txt", "x")
+    assert sorted(os.listdir(outside)) == ["secret.txt"]
+
+
+async def test_unknown_task(provider):
+    with pytest.raises(ValueError, match="Task not found"):
+        await provider.read_resource("workspace://other-task/a.py")
+    with pytest.raises(ValueError, match="Task not found"):
+        await provider.open_stream("other-task", "a.py")
+
+
+async def test_tasks_dir_recreated(provider, tasks_dir):
+    await provider.write_file(TASK_ID, "a.py", "old")
+    stale_fd = provider._tasks_fd
+
+    shutil.rmtree(tasks_dir)
+    os.mkdir(tasks_dir)
+    with open(os.path.join(tasks_dir, "a.py"), "w") as f:
+        f.write("new")
+
+    assert await provider.read_resource(_uri("a.py")) == "new"
+    assert provider._tasks_fd != stale_fd
+
+    await provider.write_file(TASK_ID, "b.py", "b")
+    assert os.path.exists(os.path.join(tasks_dir, "b.py"))
+
+
+async def test_tasks_dir_removed_before_write(provider, tasks_dir):
+    shutil.rmtree(tasks_dir)
+
+    await provider.write_file(TASK_ID, "src/a.py", "x")
+
+    assert os.path.exists(os.path.join(tasks_dir, "src", "a.py"))
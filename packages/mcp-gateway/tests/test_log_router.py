@@ -0,0 +1,127 @@
+"""Tests for the shared log stream reader in src.adapters.redis."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from src.adapters import redis as redis_module
+from src.adapters.redis import LOG_ENTRY_FIELD, LOG_STREAM_END
+from src.resources.logs import LogResourceProvider
+
+STREAM = "logstream:t1"
+
+
+async def _add(redis_adapter, stream_key: str, step: int) -> bytes:
+    fields = {LOG_ENTRY_FIELD: orjson.dumps({"step": step})}
+    return await redis_adapter.client.xadd(stream_key, fields)
+
+
+async def _get(queue: asyncio.Queue):
+    return await asyncio.wait_for(queue.get(), timeout=2)
+
+
+async def test_fans_out_new_entries(redis_adapter):
+    router = redis_adapter.log_router
+    await _add(redis_adapter, STREAM, 0)
+
+    first = await router.subscribe(STREAM)
+    second = await router.subscribe(STREAM)
+    await _add(redis_adapter, STREAM, 1)
+    await _add(redis_adapter, STREAM, 2)
+
+    assert [await _get(first), await _get(first)] == [{"step": 1}, {"step": 2}]
+    assert [await _get(second), await _get(second)] == [{"step": 1}, {"step": 2}]
+
+
+async def test_last_unsubscribe_drops_stream(redis_adapter):
+    router = redis_adapter.log_router
+    first = await router.subscribe(STREAM)
+    second = await router.subscribe(STREAM)
+
+    await router.unsubscribe(STREAM, first)
+    assert STREAM in router._last_ids
+
+    await router.unsubscribe(STREAM, second)
+    assert STREAM not in router._subs
+    assert STREAM not in router._last_ids
+
+
+async def test_slow_subscriber_is_dropped(redis_adapter, monkeypatch):
+    monkeypatch.setattr(redis_module, "LOG_SUBSCRIBER_QUEUE_SIZE", 2)
+    router = redis_adapter.log_router
+    slow = await router.subscribe(STREAM)
+
+    for step in range(3):
+        await _add(redis_adapter, STREAM, step)
+
+    # What is still buffered is delivered (less the oldest entry), then the end marker
+    assert await _get(slow) == {"step": 1}
+    assert await _get(slow) is LOG_STREAM_END
+    assert STREAM not in router._subs
+
+    # A subscriber that keeps up is unaffected by another one lagging
+    monkeypatch.setattr(redis_module, "LOG_SUBSCRIBER_QUEUE_SIZE", 10)
+    fast = await router.subscribe(STREAM)
+    await _add(redis_adapter, STREAM, 3)
+    assert await _get(fast) == {"step": 3}
+
+
+async def test_close_ends_every_stream(redis_adapter):
+    router = redis_adapter.log_router
+    queues = [await router.subscribe(STREAM), await router.subscribe("logstream:t2")]
+    readers = [asyncio.create_task(_get(queue)) for queue in queues]
+    await asyncio.sleep(0)
+
+    await router.close()
+
+    assert await asyncio.gather(*readers) == [LOG_STREAM_END, LOG_STREAM_END]
+    assert router._listener is None
+
+
+async def test_resubscribe_during_read_keeps_new_start(redis_adapter):
+    router = redis_adapter.log_router
+    first_id = await _add(redis_adapter, STREAM, 0)
+    old = await router.subscribe(STREAM)
+    assert router._last_ids[STREAM] == first_id
+
+    # Hold the listener's next read until the stream has been resubscribed
+    read_started = asyncio.Event()
+    release = asyncio.Event()
+    real_xread = redis_adapter.client.xread
+
+    async def held_xread(streams, **kwargs):
+        read_started.set()
+        await release.wait()
+        return await real_xread(streams, **kwargs)
+
+    router._listener.cancel()
+    router._listener = None
+    redis_adapter.client.xread = held_xread
+    router._listener = asyncio.create_task(router._listen())
+    await read_started.wait()
+
+    await _add(redis_adapter, STREAM, 1)
+    await router.unsubscribe(STREAM, old)
+    fresh = await router.subscribe(STREAM)
+    fresh_id = router._last_ids[STREAM]
+    redis_adapter.client.xread = real_xread
+    release.set()
+
+    # The in-flight read returns step 1, which predates the new subscription
+    await _add(redis_adapter, STREAM, 2)
+    assert await _get(fresh) == {"step": 2}
+    assert router._last_ids[STREAM] > fresh_id
+
+
+async def test_stream_logs_ends_on_close(redis_adapter):
+    provider = LogResourceProvider(redis_adapter)
+    stream = provider.stream_logs("t1")
+    reader = asyncio.create_task(anext(stream))
+    while "logstream:t1" not in redis_adapter.log_router._subs:
+        await asyncio.sleep(0)
+
+    await redis_adapter.log_router.close()
+
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(reader, timeout=2)
@@ -0,0 +1,268 @@
+"""Tests for batched log writes in src.resources.logs."""
+
+import logging
+
+import orjson
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.adapters.redis import LOG_ENTRY_FIELD, log_channel, log_stream_key
+from src.resources import logs as logs_module
+from src.resources.logs import LogResourceProvider
+
+
+class FlakyPipeline:
+    """Pipeline wrapper that fails the XADD of selected payloads with a given error."""
+
+    def __init__(self, pipe, failures: dict[bytes, Exception]):
+        self._pipe = pipe
+        self._failures = failures
+        # None for commands forwarded to the real pipeline, else the injected error
+        self._replies = []
+
+    def xadd(self, key, fields, **kwargs):
+        error = self._failures.pop(fields[LOG_ENTRY_FIELD], None)
+        self._replies.append(error)
+        if error is None:
+            self._pipe.xadd(key, fields, **kwargs)
+
+    def publish(self, *args):
+        self._replies.append(None)
+        self._pipe.publish(*args)
+
+    def expire(self, *args):
+        self._replies.append(None)
+        self._pipe.expire(*args)
+
+    async def execute(self, raise_on_error=True):
+        real = iter(await self._pipe.execute(raise_on_error=raise_on_error))
+        return [next(real) if reply is None else reply for reply in self._replies]
+
+
+class FailingPipeline(FlakyPipeline):
+    """Pipeline whose execute raises, as when the connection drops."""
+
+    def __init__(self, pipe, error: Exception):
+        super().__init__(pipe, {})
+        self._error = error
+
+    async def execute(self, raise_on_error=True):
+        raise self._error
+
+
+@pytest.fixture
+async def provider(redis_adapter, monkeypatch):
+    provider = LogResourceProvider(redis_adapter)
+    # Flush explicitly instead of from the background loop
+    monkeypatch.setattr(provider, "start", lambda: None)
+    yield provider
+    await provider.close()
+
+
+def _step(n: int) -> dict:
+    return {"step": n}
+
+
+def _payload(n: int) -> bytes:
+    return orjson.dumps(_step(n))
+
+
+async def _append(provider, task_id: str, *steps: int):
+    for n in steps:
+        await provider.append_log(task_id, _step(n))
+
+
+async def _stored(redis_adapter, task_id: str) -> list[int]:
+    """Step numbers in the task's log stream, oldest first."""
+    return [log["step"] for log in reversed(await redis_adapter.get_logs(task_id))]
+
+
+def _patch_pipeline(monkeypatch, redis_adapter, wrap):
+    real_pipeline = redis_adapter.pipeline
+    monkeypatch.setattr(redis_adapter, "pipeline", lambda *a, **kw: wrap(real_pipeline(*a, **kw)))
+
+
+async def test_flush_writes_steps_in_order(provider, redis_adapter):
+    await _append(provider, "t1", 1, 2, 3)
+    await _append(provider, "t2", 10, 11)
+
+    await provider.flush()
+
+    assert await _stored(redis_adapter, "t1") == [1, 2, 3]
+    assert await _stored(redis_adapter, "t2") == [10, 11]
+    assert 0 < await redis_adapter.client.ttl(log_stream_key("t1")) <= provider._log_stream_ttl
+    assert not provider._queue
+
+
+async def test_flush_publishes_each_step_once(provider, redis_adapter):
+    pubsub = redis_adapter.client.pubsub()
+    await pubsub.subscribe(log_channel("t1"))
+    await pubsub.get_message(timeout=1)  # subscribe confirmation
+
+    await _append(provider, "t1", 1, 2)
+    await provider.flush()
+
+    messages = [await pubsub.get_message(timeout=1) for _ in range(3)]
+    assert [m["data"] for m in messages if m] == [_payload(1), _payload(2)]
+    await pubsub.aclose()
+
+
+async def test_flush_groups_tasks_across_workers(provider, monkeypatch):
+    provider._flush_workers = 2
+    groups = []
+
+    async def record(items):
+        groups.append(items)
+        return {}
+
+    monkeypatch.setattr(provider, "_write_logs", record)
+    await _append(provider, "t1", 1, 2)
+    await _append(provider, "t2", 3)
+    await _append(provider, "t3", 4, 5)
+
+    await provider.flush()
+
+    assert len(groups) == 2
+    written = {task_id: steps for group in groups for task_id, steps in group}
+    assert sorted(task_id for group in groups for task_id, _ in group) == ["t1", "t2", "t3"]
+    assert written["t1"] == [(_payload(1), False), (_payload(2), False)]
+    assert written["t3"] == [(_payload(4), False), (_payload(5), False)]
+
+
+async def test_flush_single_task_uses_one_group(provider, monkeypatch):
+    groups = []
+
+    async def record(items):
+        groups.append(items)
+        return {}
+
+    monkeypatch.setattr(provider, "_write_logs", record)
+    await _append(provider, "t1", 1)
+
+    await provider.flush()
+
+    assert groups == [[("t1", [(_payload(1), False)])]]
+
+
+async def test_permanent_error_drops_steps(provider, redis_adapter, caplog):
+    # A leftover non-stream value makes every XADD fail with WRONGTYPE
+    await redis_adapter.client.set(log_stream_key("t1"), b"not a stream")
+    await _append(provider, "t1", 1, 2)
+    await _append(provider, "t2", 3)
+
+    with caplog.at_level(logging.ERROR, logger=logs_module.__name__):
+        await provider.flush()
+
+    assert not provider._queue
+    assert await _stored(redis_adapter, "t2") == [3]
+    assert "Dropping 2 log step(s) for task t1" in caplog.text
+    assert "WRONGTYPE" in caplog.text
+
+
+async def test_transient_error_requeues_without_republishing(
+    provider, redis_adapter, monkeypatch
+):
+    failures = {_payload(2): RedisConnectionError("connection reset")}
+    _patch_pipeline(monkeypatch, redis_adapter, lambda pipe: FlakyPipeline(pipe, failures))
+    await _append(provider, "t1", 1, 2, 3)
+
+    await provider.flush()
+
+    # Step 2's PUBLISH already went out; only its XADD is retried
+    assert provider._queue["t1"] == [(_payload(2), True)]
+    assert provider._pending.is_set()
+
+    await _append(provider, "t1", 4)
+    assert provider._queue["t1"] == [(_payload(2), True), (_payload(4), False)]
+
+    monkeypatch.undo()
+    published = []
+    real_pipeline = redis_adapter.pipeline
+
+    def recording_pipeline(*args, **kwargs):
+        pipe = real_pipeline(*args, **kwargs)
+        publish = pipe.publish
+
+        def record_publish(channel, payload):
+            published.append(payload)
+            return publish(channel, payload)
+
+        pipe.publish = record_publish
+        return pipe
+
+    monkeypatch.setattr(redis_adapter, "pipeline", recording_pipeline)
+    await provider.flush()
+
+    assert published == [_payload(4)]
+    assert await _stored(redis_adapter, "t1") == [1, 3, 2, 4]
+    assert not provider._queue
+
+
+async def test_pipeline_connection_error_requeues_group(provider, redis_adapter, monkeypatch):
+    _patch_pipeline(
+        monkeypatch,
+        redis_adapter,
+        lambda pipe: FailingPipeline(pipe, RedisConnectionError("connection refused")),
+    )
+    await _append(provider, "t1", 1, 2)
+
+    await provider.flush()
+
+    # Nothing was sent, so the steps still need publishing
+    assert provider._queue["t1"] == [(_payload(1), False), (_payload(2), False)]
+
+    monkeypatch.undo()
+    await provider.flush()
+    assert await _stored(redis_adapter, "t1") == [1, 2]
+
+
+async def test_pipeline_other_error_drops_group(provider, redis_adapter, monkeypatch, caplog):
+    _patch_pipeline(
+        monkeypatch, redis_adapter, lambda pipe: FailingPipeline(pipe, RuntimeError("bug"))
+    )
+    await _append(provider, "t1", 1, 2)
+
+    with caplog.at_level(logging.ERROR, logger=logs_module.__name__):
+        await provider.flush()
+
+    assert not provider._queue
+    assert "Dropping 2 log step(s) after write error: bug" in caplog.text
+
+
+async def test_requeue_puts_failed_steps_first(provider):
+    await _append(provider, "t1", 3, 4)
+
+    provider._requeue({"t1": [(_payload(1), True), (_payload(2), False)]})
+
+    assert provider._queue["t1"] == [
+        (_payload(1), True),
+        (_payload(2), False),
+        (_payload(3), False),
+        (_payload(4), False),
+    ]
+    assert provider._pending.is_set()
+
+
+async def test_requeue_drops_oldest_past_cap(provider, monkeypatch, caplog):
+    monkeypatch.setattr(logs_module, "MAX_QUEUED_LOG_STEPS", 3)
+    await _append(provider, "t1", 3, 4)
+
+    with caplog.at_level(logging.ERROR, logger=logs_module.__name__):
+        provider._requeue({"t1": [(_payload(1), True), (_payload(2), True)]})
+
+    assert provider._queue["t1"] == [
+        (_payload(2), True),
+        (_payload(3), False),
+        (_payload(4), False),
+    ]
+    assert "Dropping 1 oldest log step(s) for task t1" in caplog.text
+
+
+async def test_close_flushes_queued_steps(redis_adapter):
+    provider = LogResourceProvider(redis_adapter)
+    await _append(provider, "t1", 1, 2)
+
+    await provider.close()
+
+    assert await _stored(redis_adapter, "t1") == [1, 2]
+    assert provider._flusher is None
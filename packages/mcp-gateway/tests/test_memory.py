@@ -0,0 +1,218 @@
+"""Tests for memory caching and load coalescing in src.resources.memory."""
+
+import asyncio
+import time
+
+import httpx
+import orjson
+import pytest
+
+from src.resources.memory import MEMORY_TYPE_KEY_PREFIX, MemoryResourceProvider
+
+BODY = orjson.dumps({"memories": [{"id": "m1"}]}).decode()
+
+
+class FakeAPI:
+    """Backend API stand-in counting requests; responses can be held on a gate."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.gate: asyncio.Event | None = None
+        self.status = 200
+        self.body = BODY
+        self.etag = '"v1"'
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.status == 304:
+            return httpx.Response(304)
+        headers = {"etag": self.etag} if self.status == 200 else {}
+        return httpx.Response(self.status, text=self.body, headers=headers)
+
+
+@pytest.fixture
+def fake_api():
+    return FakeAPI()
+
+
+@pytest.fixture
+async def provider(redis_adapter, fake_api):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(fake_api.handler), base_url="http://api"
+    )
+    provider = MemoryResourceProvider(redis_adapter, http_client=client)
+    yield provider
+    await provider.close()
+    await client.aclose()
+
+
+async def _store(redis_adapter, task_type: str, body: str, etag: str, fresh_until: float):
+    await redis_adapter.client.hset(
+        f"{MEMORY_TYPE_KEY_PREFIX}{task_type}",
+        mapping={"body": body, "etag": etag, "fresh_until": fresh_until},
+    )
+
+
+async def _fresh_until(redis_adapter, task_type: str) -> float:
+    value = await redis_adapter.client.hget(f"{MEMORY_TYPE_KEY_PREFIX}{task_type}", "fresh_until")
+    return float(value)
+
+
+async def test_concurrent_reads_share_one_upstream_call(provider, fake_api):
+    fake_api.gate = asyncio.Event()
+
+    readers = [
+        asyncio.create_task(provider.read_resource("memory://bug_fix")) for _ in range(5)
+    ]
+    while not fake_api.requests:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    fake_api.gate.set()
+
+    assert await asyncio.gather(*readers) == [BODY] * 5
+    assert len(fake_api.requests) == 1
+    assert not provider._inflight
+
+
+async def test_cached_read_skips_api(provider, fake_api, redis_adapter):
+    assert await provider.read_resource("memory://bug_fix") == BODY
+    provider._local.clear()
+
+    # Served from Redis while fresh
+    assert await provider.read_resource("memory://bug_fix") == BODY
+    # And then from the in-process cache
+    assert await provider.read_resource("memory://bug_fix") == BODY
+    assert len(fake_api.requests) == 1
+
+
+async def test_load_error_reaches_every_waiter(provider):
+    gate = asyncio.Event()
+    calls = 0
+
+    async def failing_load(keys):
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        raise RuntimeError("upstream down")
+
+    callers = [
+        asyncio.create_task(provider._coalesce(["k"], failing_load)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream down" for r in results)
+
+
+async def test_inflight_entry_removed_after_failure(provider):
+    async def failing_load(keys):
+        raise RuntimeError("upstream down")
+
+    async def load(keys):
+        return {key: "ok" for key in keys}
+
+    with pytest.raises(RuntimeError):
+        await provider._coalesce(["k"], failing_load)
+    assert not provider._inflight
+
+    assert await provider._coalesce(["k"], load) == {"k": "ok"}
+
+
+async def test_cancelled_loader_hands_off_to_waiter(provider):
+    gate = asyncio.Event()
+    calls = []
+
+    async def load(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            await gate.wait()
+        return {key: "ok" for key in keys}
+
+    loader = asyncio.create_task(provider._coalesce(["k"], load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(provider._coalesce(["k"], load))
+    await asyncio.sleep(0)
+
+    loader.cancel()
+
+    assert await waiter == {"k": "ok"}
+    assert calls == [["k"], ["k"]]
+    with pytest.raises(asyncio.CancelledError):
+        await loader
+    assert not provider._inflight
+
+
+async def test_not_modified_refreshes_stored_body(provider, fake_api, redis_adapter):
+    await _store(redis_adapter, "bug_fix", BODY, '"v1"', time.time() - 1)
+    fake_api.status = 304
+
+    assert await provider.read_resource("memory://bug_fix") == BODY
+
+    [request] = fake_api.requests
+    assert request.headers["if-none-match"] == '"v1"'
+    assert await _fresh_until(redis_adapter, "bug_fix") > time.time()
+
+
+async def test_changed_body_replaces_stored_one(provider, fake_api, redis_adapter):
+    await _store(redis_adapter, "bug_fix", BODY, '"v1"', time.time() - 1)
+    fake_api.body = orjson.dumps({"memories": []}).decode()
+    fake_api.etag = '"v2"'
+
+    assert await provider.read_resource("memory://bug_fix") == fake_api.body
+
+    stored = await redis_adapter.client.hgetall(f"{MEMORY_TYPE_KEY_PREFIX}bug_fix")
+    assert stored[b"body"].decode() == fake_api.body
+    assert stored[b"etag"] == b'"v2"'
+
+
+async def test_server_error_serves_stale_body(provider, fake_api, redis_adapter):
+    stale_until = time.time() - 1
+    await _store(redis_adapter, "bug_fix", BODY, '"v1"', stale_until)
+    fake_api.status = 503
+    fake_api.body = "unavailable"
+
+    assert await provider.read_resource("memory://bug_fix") == BODY
+
+    # Not marked fresh or cached locally, so the next read revalidates again
+    assert await _fresh_until(redis_adapter, "bug_fix") == pytest.approx(stale_until)
+    assert not provider._local
+    await provider.read_resource("memory://bug_fix")
+    assert len(fake_api.requests) == 2
+
+
+async def test_server_error_without_stored_body(provider, fake_api):
+    fake_api.status = 500
+
+    payload = orjson.loads(await provider.read_resource("memory://bug_fix"))
+
+    assert payload["memories"] == []
+    assert "500" in payload["error"]
+
+
+async def test_search_is_cached(provider, fake_api):
+    first = await provider.read_resource("memory://search?keywords=Redis,%20cache")
+    provider._local.clear()
+    second = await provider.read_resource("memory://search?keywords=cache,redis")
+
+    assert first == second == BODY
+    assert len(fake_api.requests) == 1
+
+
+async def test_close_cancels_prewarm(provider, fake_api):
+    fake_api.gate = asyncio.Event()
+
+    await provider.list_resources()
+    prewarm = provider._prewarm
+    while not fake_api.requests:
+        await asyncio.sleep(0)
+
+    await provider.close()
+
+    assert prewarm.cancelled()
+    assert provider._prewarm is None
+    assert not provider._client.is_closed  # shared client is left to its owner
@@ -0,0 +1,192 @@
+"""Tests for JWT verification in src.auth.token."""
+
+import time
+
+import jwt
+import pytest
+
+from src.auth.token import TokenManager, _b64url_decode
+
+SECRET = "test-secret-" + "x" * 64
+
+
+def _segments(token: str) -> list[str]:
+    return token.split(".")
+
+
+def _tamper(segment: str) -> str:
+    """Flip the first character of a base64url segment."""
+    return ("B" if segment[0] == "A" else "A") + segment[1:]
+
+
+@pytest.fixture
+def manager():
+    tm = TokenManager()
+    tm.secret = SECRET
+    tm.algorithm = "HS256"
+    return tm
+
+
+def _encode(claims: dict, secret: str = SECRET, algorithm: str = "HS256", **kw) -> str:
+    return jwt.encode(claims, secret, algorithm=algorithm, **kw)
+
+
+def test_valid_token(manager):
+    token = manager.create_token("coder-01")
+
+    payload = manager.verify_token(token)
+
+    assert payload is not None
+    assert payload.agent_id == "coder-01"
+    assert payload.exp.timestamp() > time.time()
+
+
+def test_valid_token_is_cached(manager):
+    token = manager.create_token("coder-01")
+
+    first = manager.verify_token(token)
+
+    assert token in manager._cache
+    assert manager.verify_token(token) is first
+
+
+def test_tampered_signature(manager):
+    header, payload, signature = _segments(manager.create_token("coder-01"))
+
+    assert manager.verify_token(f"{header}.{payload}.{_tamper(signature)}") is None
+
+
+def test_tampered_payload(manager):
+    header, _, signature = _segments(manager.create_token("coder-01"))
+    forged = _segments(_encode({"agent_id": "admin", "exp": int(time.time()) + 60}))[1]
+
+    assert manager.verify_token(f"{header}.{forged}.{signature}") is None
+
+
+def test_wrong_secret(manager):
+    other_secret = "other-" + "y" * 64
+    token = _encode({"agent_id": "coder-01", "exp": int(time.time()) + 60}, secret=other_secret)
+
+    assert manager.verify_token(token) is None
+
+
+def test_alg_none_rejected(manager):
+    token = _encode({"agent_id": "coder-01", "exp": int(time.time()) + 60}, None, "none")
+
+    assert manager.verify_token(token) is None
+    # Also with a signature segment that is not empty
+    assert manager.verify_token(token + _segments(manager.create_token("x"))[2]) is None
+
+
+def test_wrong_algorithm_header(manager):
+    token = _encode({"agent_id": "coder-01", "exp": int(time.time()) + 60}, algorithm="HS512")
+
+    assert manager.verify_token(token) is None
+
+
+def test_header_algorithm_mismatch_with_valid_hs256_signature(manager):
+    # Header claims HS512 but the signature is HS256 over the signing input
+    token = _encode(
+        {"agent_id": "coder-01", "exp": int(time.time()) + 60},
+        headers={"alg": "HS512"},
+    )
+
+    assert manager.verify_token(token) is None
+
+
+def test_expired_token(manager):
+    token = _encode({"agent_id": "coder-01", "exp": int(time.time()) - 1})
+
+    assert manager.verify_token(token) is None
+
+
+def test_not_yet_valid_token(manager):
+    now = int(time.time())
+    token = _encode({"agent_id": "coder-01", "exp": now + 120, "nbf": now + 60})
+
+    assert manager.verify_token(token) is None
+
+
+def test_non_numeric_exp(manager):
+    token = _encode({"agent_id": "coder-01", "exp": "tomorrow"})
+
+    assert manager.verify_token(token) is None
+
+
+def test_missing_exp_is_rejected(manager):
+    token = _encode({"agent_id": "coder-01"})
+
+    assert manager.verify_token(token) is None
+
+
+def test_missing_agent_id_is_rejected(manager):
+    token = _encode({"exp": int(time.time()) + 60})
+
+    assert manager.verify_token(token) is None
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "abc",
+        "a.b",
+        "a.b.c",
+        "...",
+        "!!!.@@@.###",
+        "é.é.é",
+        # Header that decodes to JSON but not an object
+        "WzFd.e30.",
+    ],
+)
+def test_malformed_segments(manager, token):
+    assert manager.verify_token(token) is None
+
+
+def test_extra_segment(manager):
+    token = manager.create_token("coder-01")
+
+    assert manager.verify_token(token + ".extra") is None
+
+
+def test_cache_cleared_when_secret_changes(manager):
+    token = manager.create_token("coder-01")
+    assert manager.verify_token(token) is not None
+
+    manager.secret = "rotated-secret"
+
+    assert manager.verify_token(token) is None
+    assert manager._cache == {}
+
+
+def test_cache_cleared_when_algorithm_changes(manager):
+    token = manager.create_token("coder-01")
+    assert manager.verify_token(token) is not None
+
+    manager.algorithm = "HS512"
+
+    assert manager.verify_token(token) is None
+    assert manager.verify_token(manager.create_token("coder-01")) is not None
+
+
+def test_cached_token_expires(manager):
+    token = manager.create_token("coder-01")
+    payload = manager.verify_token(token)
+    manager._cache[token] = (time.time() - 1, payload)
+
+    assert manager.verify_token(token) is None
+    assert token not in manager._cache
+
+
+def test_non_hs256_uses_pyjwt(manager):
+    manager.algorithm = "HS384"
+    token = manager.create_token("coder-01")
+
+    assert manager.verify_token(token).agent_id == "coder-01"
+    assert manager.verify_token(_encode({"agent_id": "x", "exp": 1}, algorithm="HS384")) is None
+
+
+def test_b64url_decode_handles_missing_padding():
+    assert _b64url_decode(b"YQ") == b"a"
+    assert _b64url_decode(b"YWI") == b"ab"
+    assert _b64url_decode(b"YWJj") == b"abc"
@@ -1,25 +1,20 @@
 """Generate all 96 voice lines for 3 voice packs using Bark TTS.
 
 Speaker 0, temp 0.8/0.8, flat radio static + opening squelch, max 2s.
-5 second delay between clips to avoid GPU issues.
+Clips run back to back; the CUDA cache is only cleared when allocated
+memory passes CUDA_CLEAR_THRESHOLD. Radio effect and WAV writes run in
+two spawned worker processes, overlapping the next clip's generation
+without competing with it for the GIL. Set BARK_FP16=1 to run the
+text/coarse/fine GPT models in fp16 on CUDA; it is off until its output
+has been compared against full precision on the bark-test.py phrases.
 """
 
 import os
 import time
-import numpy as np
-from scipy.io.wavfile import write as write_wav
-from scipy.signal import butter, lfilter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
-os.environ["SUNO_USE_SMALL_MODELS"] = "0"
-
-import torch
-_original_torch_load = torch.load
-def _patched_torch_load(*args, **kwargs):
-    kwargs.setdefault("weights_only", False)
-    return _original_torch_load(*args, **kwargs)
-torch.load = _patched_torch_load
-
-from bark import SAMPLE_RATE, generate_audio, preload_models
+from bark_radio import post_and_write
 
 BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "packages", "ui", "public", "audio")
 
@@ -27,47 +22,8 @@ SPEAKER = "v2/en_speaker_0"
 TEXT_TEMP = 0.8
 WAVE_TEMP = 0.8
 MAX_SECONDS = 2.0
-REST_BETWEEN = 5  # seconds
-
-
-def add_radio_effect(audio, sr):
-    """Flat radio static + opening squelch click."""
-    n = len(audio)
-    nyq = sr / 2
-
-    # Bandpass filter (300-3400 Hz)
-    low, high = 300 / nyq, 3400 / nyq
-    b, a = butter(4, [low, high], btype='band')
-    filtered = lfilter(b, a, audio)
-
-    # Light compression
-    filtered = np.tanh(filtered * 2.0) * 0.7
-
-    # Flat radio static
-    noise = np.random.randn(n) * 0.04
-    b_n, a_n = butter(2, [200 / nyq, 4000 / nyq], btype='band')
-    static = lfilter(b_n, a_n, noise)
-
-    # Opening squelch click (~30ms burst)
-    squelch_len = int(sr * 0.03)
-    squelch = np.random.randn(squelch_len) * 0.15
-    squelch *= np.linspace(1, 0.3, squelch_len)
-    squelch_padded = np.zeros(n)
-    squelch_padded[:squelch_len] = squelch
-
-    # Random crackle pops (mild)
-    crackle = np.zeros(n)
-    n_pops = np.random.randint(3, 8)
-    for _ in range(n_pops):
-        pos = np.random.randint(0, n)
-        width = np.random.randint(5, 20)
-        end = min(pos + width, n)
-        crackle[pos:end] = np.random.randn(end - pos) * 0.06
-
-    result = filtered + static + squelch_padded + crackle
-    result = result / (np.max(np.abs(result)) + 1e-6) * 0.9
-    return result
-
+CUDA_CLEAR_THRESHOLD = 6 * 1024**3  # bytes allocated before emptying the cache
+HALF_PRECISION = os.environ.get("BARK_FP16") == "1"
 
 # ── Voice line definitions ──────────────────────────────────────────
 # Format: (filename_without_ext, spoken_text)
@@ -211,25 +167,62 @@ PACKS = [
 ]
 
 
-def generate_clip(text, filepath):
-    """Generate a single voice clip with radio effect."""
-    audio = generate_audio(
-        text,
-        history_prompt=SPEAKER,
-        text_temp=TEXT_TEMP,
-        waveform_temp=WAVE_TEMP,
-    )
+def _import_bark():
+    """Import torch and Bark.
+
+    Only called in the main process: spawned workers re-run this module's
+    top level, which therefore stays free of the heavy imports.
+    """
+    global torch, SAMPLE_RATE, generate_audio, preload_models, bark_generation
+
+    os.environ["SUNO_USE_SMALL_MODELS"] = "0"
+
+    import torch
+    _original_torch_load = torch.load
+    def _patched_torch_load(*args, **kwargs):
+        kwargs.setdefault("weights_only", False)
+        return _original_torch_load(*args, **kwargs)
+    torch.load = _patched_torch_load
+
+    from bark import SAMPLE_RATE, generate_audio, preload_models
+    from bark import generation as bark_generation
+
+
+def _half_models():
+    """Cast Bark's text/coarse/fine GPT models to fp16 (the codec stays fp32)."""
+    for key in ("text", "coarse", "fine"):
+        entry = bark_generation.models.get(key)
+        model = entry["model"] if isinstance(entry, dict) else entry
+        if model is not None:
+            model.half().to("cuda")
+
+
+def generate_clip(text):
+    """Generate a single raw voice clip (float32, max MAX_SECONDS)."""
+    with torch.autocast("cuda", dtype=torch.float16, enabled=HALF_PRECISION):
+        audio = generate_audio(
+            text,
+            history_prompt=SPEAKER,
+            text_temp=TEXT_TEMP,
+            waveform_temp=WAVE_TEMP,
+        )
     max_samples = int(SAMPLE_RATE * MAX_SECONDS)
-    audio = audio[:max_samples]
-    audio = add_radio_effect(audio, SAMPLE_RATE)
-    write_wav(filepath, SAMPLE_RATE, (audio * 32767).astype(np.int16))
+    return audio[:max_samples]
 
 
 if __name__ == "__main__":
+    _import_bark()
+    HALF_PRECISION = HALF_PRECISION and torch.cuda.is_available()
+
     print("Loading Bark models to GPU...")
     preload_models()
+    if HALF_PRECISION:
+        _half_models()
     print("Ready!\n")
 
+    # Spawned, not forked: the workers must not inherit the CUDA context
+    post_pool = ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn"))
+
     total = sum(len(lines) for _, lines in PACKS)
     done = 0
     failed = []
@@ -242,6 +235,7 @@ if __name__ == "__main__":
         print(f"  PACK: {pack_name} ({len(lines)} clips)")
         print(f"{'='*60}")
 
+        writes = []
         for filename, text in lines:
             done += 1
             filepath = os.path.join(pack_dir, f"{filename}.wav")
@@ -251,15 +245,26 @@ if __name__ == "__main__":
             print(f"    > {pack_name}/{filename}.wav  (ETA: {eta/60:.1f}m)")
 
             try:
-                generate_clip(text, filepath)
+                audio = generate_clip(text)
+                future = post_pool.submit(post_and_write, audio, filepath, SAMPLE_RATE)
+                writes.append((filename, text, future))
                 print(f"    OK")
             except Exception as e:
                 print(f"    FAILED: {e}")
                 failed.append((pack_name, filename, text, str(e)))
 
-            if done < total:
-                print(f"    Resting {REST_BETWEEN}s...")
-                time.sleep(REST_BETWEEN)
+            if torch.cuda.is_available() and torch.cuda.memory_allocated() > CUDA_CLEAR_THRESHOLD:
+                torch.cuda.empty_cache()
+
+        # Wait for this pack's post-processing and writes
+        for filename, text, future in writes:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"    WRITE FAILED: {pack_name}/{filename}.wav: {e}")
+                failed.append((pack_name, filename, text, str(e)))
+
+    post_pool.shutdown()
 
     elapsed = time.time() - start_time
     print(f"\n{'='*60}")
@@ -0,0 +1,85 @@
+"""Radio post-processing for Bark voice clips.
+
+Kept free of torch/bark imports so the post-processing worker processes
+spawned by bark-generate-all.py start with only numpy, scipy and soundfile.
+"""
+
+import functools
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import butter, sosfilt
+
+_rng = np.random.default_rng()
+
+# Scratch buffers reused across add_radio_effect calls, grown to the longest
+# clip seen. Each post-processing worker process runs one clip at a time.
+_SCRATCH = tuple(np.empty(0) for _ in range(3))
+
+
+@functools.lru_cache(maxsize=None)
+def _radio_filters(sr):
+    """Voice (300-3400 Hz) and static (200-4000 Hz) bandpass filters as SOS."""
+    nyq = sr / 2
+    voice = butter(4, [300 / nyq, 3400 / nyq], btype='band', output='sos')
+    static = butter(2, [200 / nyq, 4000 / nyq], btype='band', output='sos')
+    return voice, static
+
+
+def _scratch(n):
+    """Length-n views of the reusable noise/squelch/crackle buffers."""
+    global _SCRATCH
+    if len(_SCRATCH[0]) < n:
+        _SCRATCH = tuple(np.empty(n) for _ in _SCRATCH)
+    return tuple(buf[:n] for buf in _SCRATCH)
+
+
+def add_radio_effect(audio, sr):
+    """Flat radio static + opening squelch click."""
+    n = len(audio)
+    sos_voice, sos_static = _radio_filters(sr)
+    noise, squelch, crackle = _scratch(n)
+
+    # Bandpass filter (300-3400 Hz)
+    filtered = sosfilt(sos_voice, audio)
+
+    # Light compression
+    filtered *= 2.0
+    np.tanh(filtered, out=filtered)
+    filtered *= 0.7
+
+    # Flat radio static
+    _rng.standard_normal(out=noise)
+    noise *= 0.04
+    static = sosfilt(sos_static, noise)
+
+    # Opening squelch click (~30ms burst)
+    squelch_len = int(sr * 0.03)
+    _rng.standard_normal(out=squelch[:squelch_len])
+    squelch[:squelch_len] *= np.linspace(0.15, 0.045, squelch_len)
+    squelch[squelch_len:] = 0
+
+    # Random crackle pops (mild), scattered in one shot
+    crackle.fill(0)
+    n_pops = _rng.integers(3, 8)
+    positions = _rng.integers(0, n, n_pops)
+    widths = _rng.integers(5, 20, n_pops)
+    starts = np.repeat(positions, widths)
+    idx = starts + np.arange(widths.sum()) - np.repeat(np.cumsum(widths) - widths, widths)
+    keep = idx < n
+    crackle[idx[keep]] = _rng.standard_normal(keep.sum()) * 0.06
+
+    # Mix into the filtered voice buffer, which this call owns
+    result = filtered
+    result += static
+    result += squelch
+    result += crackle
+    result *= 0.9 / (np.max(np.abs(result)) + 1e-6)
+    return result
+
+
+def post_and_write(audio, filepath, sr):
+    """Apply the radio effect and write a 16-bit WAV (runs in a worker process)."""
+    result = add_radio_effect(audio, sr)
+    np.clip(result, -1, 1, out=result)
+    sf.write(filepath, result, sr, subtype='PCM_16')